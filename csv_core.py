@@ -0,0 +1,1770 @@
+"""Data layer of the CSV viewer: loading, conversion, filtering, statistics and export.
+
+Nothing here depends on Tk, so every step can be scripted, used from a
+notebook or profiled headlessly; ``Dataset`` bundles them for one file.
+"""
+import ast
+import bz2
+import codecs
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+import lzma
+import os
+import re
+import shutil
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fractions import Fraction
+import numpy as np
+import pandas as pd
+from scipy import ndimage, signal
+
+logger = logging.getLogger(__name__)
+
+# Timestamp format written by the acquisition system: "30/01/2026 13:57:56,630000"
+FRENCH_DATETIME_FORMAT = '%d/%m/%Y %H:%M:%S.%f'
+
+# Multi-file comparison: curves are aligned on a common grid of at most this many points
+COMPARE_MAX_POINTS = 20000
+# Multi-file comparison: memory allowed for the main file plus all comparison runs (bytes)
+COMPARE_MEMORY_BUDGET = 2 * 1024 ** 3
+
+# Event detection: default peak prominence (fraction of range) and event labels
+EVENT_PEAK_PROMINENCE = 0.1
+EVENT_KINDS = ['Franchissement ↑', 'Franchissement ↓', 'Pic', 'Palier', 'Perte de signal']
+
+# Range statistics: columns whose prefix tables are kept for repeated queries
+STATS_TABLE_COLUMNS = 4
+
+# Uniform resampling size cap for FFT cross-correlation (lag estimation)
+ALIGN_MAX_POINTS = 1 << 21
+# Binary table formats (export and reload without text parsing); Parquet and Feather need pyarrow
+BINARY_FORMATS = {'.parquet': 'Parquet', '.feather': 'Feather', '.arrow': 'Feather', '.npz': 'NumPy'}
+PARQUET_COMPRESSION = 'zstd'
+# Compressed CSV files, read by pandas through streaming decompression (.zst needs zstandard)
+COMPRESSED_FORMATS = {'.gz': 'gzip', '.zip': 'zip', '.xz': 'xz', '.bz2': 'bz2', '.zst': 'zstd'}
+
+# Resampling: largest down factor of the up/down ratio approximating the target rate
+RESAMPLE_MAX_DENOMINATOR = 100
+
+
+def _detect_encoding(sample):
+    """Guess the text encoding of a file from its first bytes.
+
+    A BOM wins; otherwise UTF-16 is recognized by its NUL bytes, valid UTF-8
+    is kept as is and anything else is taken as Windows cp1252 (latin-1 when
+    it contains bytes cp1252 leaves undefined).
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    if len(sample) >= 4 and sample.count(0) > len(sample) // 4:
+        return 'utf-16-le' if sample[1::2].count(0) > sample[0::2].count(0) else 'utf-16-be'
+    try:
+        sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut by the end of the sample is still UTF-8
+        if e.reason == 'unexpected end of data' and e.start >= len(sample) - 3:
+            return 'utf-8'
+    if any(byte in sample for byte in b'\x81\x8d\x8f\x90\x9d'):
+        return 'latin-1'
+    return 'cp1252'
+
+
+def file_compression(path):
+    """Compression of a file from its extension (None if not compressed)"""
+    return COMPRESSED_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def file_stem(path):
+    """File name without its extension, nor its compression extension (essai.csv.gz -> essai)"""
+    name = os.path.basename(path)
+    if file_compression(name) is not None:
+        name = os.path.splitext(name)[0]
+    return os.path.splitext(name)[0]
+
+
+def _read_head(path, size):
+    """First size bytes of a file, decompressed on the fly for compressed files"""
+    compression = file_compression(path)
+    if compression is None:
+        with open(path, 'rb') as f:
+            return f.read(size)
+    if compression == 'zip':
+        with zipfile.ZipFile(path) as archive:
+            names = [n for n in archive.namelist() if not n.endswith('/')]
+            if len(names) != 1:
+                raise ValueError("l'archive ZIP doit contenir un seul fichier")
+            with archive.open(names[0]) as f:
+                return f.read(size)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError('le format .zst nécessite le module zstandard')
+        try:
+            with open(path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw) as f:
+                return f.read(size)
+        except zstandard.ZstdError as e:
+            raise ValueError(f'fichier .zst illisible : {e}')
+    opener = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}[compression]
+    with opener(path, 'rb') as f:
+        return f.read(size)
+
+
+def _sniff_csv_format(path):
+    """Detect separator, decimal character and encoding from the beginning of a CSV file"""
+    sep = None
+    decimal_char = '.'
+    encoding = 'utf-8'
+    try:
+        raw = _read_head(path, 4096)
+    except (OSError, EOFError, lzma.LZMAError, zipfile.BadZipFile):
+        return sep, decimal_char, encoding
+    encoding = _detect_encoding(raw)
+    if encoding != 'utf-8':
+        logger.info('%s: encodage détecté %s', path, encoding)
+    sample = raw.decode(encoding, errors='ignore')
+    try:
+        sniffer = csv.Sniffer()
+        dialect = sniffer.sniff(sample)
+        sep = dialect.delimiter
+        # detect decimal comma in sample (e.g. '0,1' but not when comma is separator)
+        if sep == ';' or (sep != ',' and bool(re.search(r"\d,\d", sample))):
+            decimal_char = ','
+    except Exception:
+        # If sniffing fails, check if semicolon is present (common French CSV format)
+        logger.info('%s: séparateur non détecté par csv.Sniffer', path)
+        if ';' in sample:
+            sep = ';'
+            if bool(re.search(r"\d,\d", sample)):
+                decimal_char = ','
+    return sep, decimal_char, encoding
+
+
+def _parse_french_datetime(values):
+    """Vectorized parse of French timestamps, invalid values become NaT"""
+    # Replace comma with dot for microseconds
+    values = values.astype(str).str.replace(',', '.', regex=False)
+    return pd.to_datetime(values, format=FRENCH_DATETIME_FORMAT, errors='coerce')
+
+
+def _convert_columns(df, time_origins=None):
+    """Convert datetime columns to seconds and French decimal strings to floats (in place).
+
+    When ``time_origins`` is given (column -> first timestamp), those columns are
+    converted relative to the known origin instead of being detected again, so
+    that rows appended later share the time base of the initial load.
+    Returns the time origins used.
+    """
+    if time_origins is None:
+        time_origins = {}
+        for col in df.columns:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                try:
+                    # Check if it looks like a datetime with French format (dd/mm/yyyy HH:MM:SS,microseconds)
+                    first_val = str(df[col].iloc[0])
+                    if '/' in first_val and ':' in first_val:
+                        datetime_col = _parse_french_datetime(df[col])
+                        if datetime_col.notna().all():
+                            # Convert to seconds from start
+                            time_origins[col] = datetime_col.iloc[0]
+                            df[col] = (datetime_col - datetime_col.iloc[0]).dt.total_seconds()
+                except Exception:
+                    pass  # Keep original if conversion fails
+    else:
+        for col, origin in time_origins.items():
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = (_parse_french_datetime(df[col]) - origin).dt.total_seconds()
+
+    # Convert string columns with French decimal format (comma) to numeric
+    for col in df.columns:
+        if df[col].dtype == object:
+            try:
+                # Try to convert string with comma decimal to float
+                df[col] = df[col].astype(str).str.replace(',', '.').astype(float)
+            except Exception:
+                pass  # Keep as string if conversion fails
+    return time_origins
+
+
+# Rolling-window operators: label -> (operator, export column suffix)
+ROLLING_OPERATORS = {
+    'Moyenne': ('mean', 'moy'),
+    'RMS': ('rms', 'rms'),
+    'Écart-type': ('std', 'std'),
+    'Min': ('min', 'min'),
+    'Max': ('max', 'max'),
+}
+
+
+def rolling_window(values, n, op='mean'):
+    """Centered rolling operator over n samples, O(len) whatever the window.
+
+    mean/rms/std use cumulative sums of the centered signal, min/max a
+    sliding-window extrema filter. NaN samples are ignored in the windows.
+    """
+    values = np.asarray(values, dtype=float)
+    length = len(values)
+    n = max(1, int(n))
+    nan_mask = np.isnan(values)
+    if op in ('min', 'max'):
+        if op == 'min':
+            res = ndimage.minimum_filter1d(np.where(nan_mask, np.inf, values), n, mode='nearest')
+        else:
+            res = ndimage.maximum_filter1d(np.where(nan_mask, -np.inf, values), n, mode='nearest')
+        res[np.isinf(res)] = np.nan
+        return res
+    if op not in ('mean', 'rms', 'std'):
+        raise ValueError(f'opérateur inconnu : {op}')
+
+    # Window [i - n//2, i - n//2 + n) clipped to the signal
+    half = n // 2
+    idx = np.arange(length)
+    lo = np.clip(idx - half, 0, length)
+    hi = np.clip(idx - half + n, 0, length)
+    offset = float(np.nanmean(values)) if not nan_mask.all() else 0.0
+    centered = np.where(nan_mask, 0.0, values - offset)
+    count = np.concatenate(([0], np.cumsum(~nan_mask)))
+    csum = np.concatenate(([0.0], np.cumsum(centered)))
+    csum2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cnt = count[hi] - count[lo]
+        m = (csum[hi] - csum[lo]) / cnt
+        var = np.maximum((csum2[hi] - csum2[lo]) / cnt - m * m, 0.0)
+    mean = offset + m
+    if op == 'mean':
+        return mean
+    if op == 'std':
+        return np.sqrt(var)
+    return np.sqrt(var + mean * mean)
+
+
+def _moving_average(values, n):
+    """Centered moving average over n samples"""
+    return rolling_window(values, n, 'mean')
+
+
+# Names usable in derived channel expressions, besides the columns
+EXPRESSION_FUNCTIONS = {
+    'abs': np.abs, 'sqrt': np.sqrt, 'exp': np.exp, 'log': np.log, 'log10': np.log10,
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan, 'arctan2': np.arctan2, 'hypot': np.hypot,
+    'minimum': np.minimum, 'maximum': np.maximum, 'where': np.where, 'clip': np.clip,
+    'gradient': np.gradient, 'cumsum': np.cumsum, 'movavg': _moving_average,
+    'movrms': lambda values, n: rolling_window(values, n, 'rms'),
+    'movstd': lambda values, n: rolling_window(values, n, 'std'),
+    'movmin': lambda values, n: rolling_window(values, n, 'min'),
+    'movmax': lambda values, n: rolling_window(values, n, 'max'),
+}
+EXPRESSION_CONSTANTS = {'pi': np.pi, 'g': 9.80665}
+# Functions whose value at a sample depends on its neighbours (not computable row by row)
+HISTORY_FUNCTIONS = {'gradient', 'cumsum', 'movavg', 'movrms', 'movstd', 'movmin', 'movmax'}
+
+# Derived channels available whenever their source columns exist
+BUILTIN_DERIVED = {
+    'Effort Z total (N)': '`Effort Z1 (N)` + `Effort Z2 (N)` + `Effort Z3 (N)`',
+}
+
+# Per-user settings (derived channel definitions, ...)
+SETTINGS_DIR = os.path.join(os.path.expanduser('~'), '.courbecsv')
+DERIVED_FILE = os.path.join(SETTINGS_DIR, 'derived_channels.json')
+SESSION_FILE = os.path.join(SETTINGS_DIR, 'session.json')
+# Parsed (and filtered) columns of recently loaded CSV files, one directory per file version
+CACHE_DIR = os.path.join(SETTINGS_DIR, 'cache')
+CACHE_MAX_FILES = 5
+CACHE_MAX_BYTES = 8 << 30
+# Unfinished cache writes older than this are leftovers of a closed app
+CACHE_TMP_MAX_AGE_S = 3600
+CACHE_MIN_BYTES = 1 << 20
+# Two-phase load: text files from this size are first previewed with about
+# PREVIEW_ROWS lines spread over the file, read by seeking
+PREVIEW_MIN_BYTES = 32 << 20
+PREVIEW_ROWS = 4000
+
+
+class DerivedExpression:
+    """Vectorized NumPy expression over columns, compiled once from a restricted AST.
+
+    Column names are written between backquotes (`Effort Z1 (N)`) or directly
+    when they are valid identifiers. Only arithmetic, comparisons and the
+    functions of EXPRESSION_FUNCTIONS are accepted.
+    """
+    _ALLOWED_NODES = (
+        ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Load,
+        ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+        ast.USub, ast.UAdd, ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq,
+        ast.BitAnd, ast.BitOr, ast.Invert,
+    )
+
+    def __init__(self, expression):
+        self.expression = expression
+        self._aliases = {}
+
+        def alias(match):
+            name = match.group(1)
+            if name not in self._aliases:
+                self._aliases[name] = f'_col{len(self._aliases)}'
+            return self._aliases[name]
+
+        source = re.sub(r'`([^`]+)`', alias, expression)
+        try:
+            tree = ast.parse(source.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f'expression invalide : {e.msg}')
+
+        # Whitelist the syntax tree and collect referenced columns
+        variables = {v: k for k, v in self._aliases.items()}
+        self.columns = []
+        self.functions = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, self._ALLOWED_NODES):
+                raise ValueError(f'élément non autorisé : {type(node).__name__}')
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in EXPRESSION_FUNCTIONS or node.keywords:
+                    raise ValueError('seules les fonctions ' + ', '.join(EXPRESSION_FUNCTIONS) + ' sont autorisées')
+                self.functions.add(node.func.id)
+            elif isinstance(node, ast.Name) and node.id not in EXPRESSION_FUNCTIONS and node.id not in EXPRESSION_CONSTANTS:
+                col = variables.get(node.id, node.id)
+                if col not in self.columns:
+                    self.columns.append(col)
+            elif isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                raise ValueError('seules les constantes numériques sont autorisées')
+        self._code = compile(tree, '<voie dérivée>', 'eval')
+
+    def evaluate(self, df):
+        """Evaluate on the columns of df (all referenced columns must exist)"""
+        namespace = dict(EXPRESSION_FUNCTIONS)
+        namespace.update(EXPRESSION_CONSTANTS)
+        for col in self.columns:
+            namespace[self._aliases.get(col, col)] = df[col].to_numpy(dtype=float)
+        result = eval(self._code, {'__builtins__': {}}, namespace)
+        return np.broadcast_to(np.asarray(result, dtype=float), (len(df),)).copy()
+
+
+def derivable_channels(columns, definitions):
+    """Derived channel names computable from the given columns (in definition order)"""
+    available = set(columns)
+    deps = {}
+    for name, expression in definitions.items():
+        try:
+            deps[name] = DerivedExpression(expression).columns
+        except ValueError:
+            continue
+    result = []
+    changed = True
+    while changed:
+        changed = False
+        for name, cols in deps.items():
+            if name not in available and all(c in available for c in cols):
+                available.add(name)
+                result.append(name)
+                changed = True
+    return [name for name in definitions if name in result]
+
+
+def materialize_derived(df, definitions, name, _stack=()):
+    """Compute a derived column (and the derived columns it uses) into df.
+
+    Returns False if the column can't be computed from df.
+    """
+    if name in df.columns:
+        return True
+    expression = definitions.get(name)
+    if expression is None or name in _stack:
+        return False
+    compiled = DerivedExpression(expression)
+    for col in compiled.columns:
+        if not materialize_derived(df, definitions, col, _stack + (name,)):
+            return False
+    df[name] = compiled.evaluate(df)
+    return True
+
+
+def uses_history(definitions, name, _stack=()):
+    """Whether a derived column (or a derived column it uses) calls a HISTORY_FUNCTIONS function"""
+    expression = definitions.get(name)
+    if expression is None or name in _stack:
+        return False
+    try:
+        compiled = DerivedExpression(expression)
+    except ValueError:
+        return False
+    return (not compiled.functions.isdisjoint(HISTORY_FUNCTIONS)
+            or any(uses_history(definitions, col, _stack + (name,)) for col in compiled.columns))
+
+
+def column_signature(columns):
+    """Stable key identifying a file layout by its column names"""
+    return hashlib.sha1('\x1f'.join(sorted(map(str, columns))).encode('utf-8')).hexdigest()
+
+
+def load_derived_definitions(signature):
+    """Built-in definitions plus the ones saved for this column signature"""
+    definitions = dict(BUILTIN_DERIVED)
+    try:
+        with open(DERIVED_FILE, 'r', encoding='utf-8') as f:
+            definitions.update(json.load(f).get(signature, {}))
+    except (OSError, ValueError):
+        pass
+    return definitions
+
+
+def save_derived_definitions(signature, definitions):
+    """Persist the user definitions (those differing from the built-ins) for a signature"""
+    try:
+        with open(DERIVED_FILE, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    saved[signature] = {k: v for k, v in definitions.items() if BUILTIN_DERIVED.get(k) != v}
+    os.makedirs(SETTINGS_DIR, exist_ok=True)
+    with open(DERIVED_FILE, 'w', encoding='utf-8') as f:
+        json.dump(saved, f, ensure_ascii=False, indent=2)
+
+
+def _cache_dir(path):
+    """Cache directory of the current version of a file (path, size and mtime)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = f'{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}'
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def _save_parsed_cache(path, df, meta):
+    """Store the parsed columns of a file as .npy files (meta.json written last)"""
+    directory = _cache_dir(path)
+    if directory is None or os.path.exists(directory):
+        return
+    tmp = f'{directory}.tmp{threading.get_ident()}'
+    try:
+        os.makedirs(tmp)
+        for i, col in enumerate(df.columns):
+            values = df[col].to_numpy()
+            np.save(os.path.join(tmp, f'c{i}.npy'), values.astype(str) if values.dtype == object else values)
+        meta = dict(meta, columns=[str(c) for c in df.columns],
+                    time_origins={col: str(origin) for col, origin in meta['time_origins'].items()})
+        with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp, directory)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        return
+    prune_cache()
+
+
+def _directory_bytes(directory):
+    try:
+        return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+    except OSError:
+        return 0
+
+
+def prune_cache():
+    """Keep the most recent cached files within CACHE_MAX_FILES and CACHE_MAX_BYTES.
+
+    Also removes the temporary directories of writes interrupted when the
+    app was closed (the writer runs in a daemon thread).
+    """
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    entries = []
+    now = time.time()
+    for name in names:
+        directory = os.path.join(CACHE_DIR, name)
+        try:
+            mtime = os.path.getmtime(directory)
+        except OSError:
+            continue
+        if '.tmp' in name:
+            if now - mtime > CACHE_TMP_MAX_AGE_S:
+                shutil.rmtree(directory, ignore_errors=True)
+        else:
+            entries.append((mtime, directory))
+    entries.sort(reverse=True)
+    total = 0
+    for k, (_, directory) in enumerate(entries):
+        total += _directory_bytes(directory)
+        # The most recent file is kept whatever its size
+        if k >= CACHE_MAX_FILES or (k > 0 and total > CACHE_MAX_BYTES):
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def _load_parsed_cache(path):
+    """Parsed columns of a file from the cache, memory-mapped (None if not cached)"""
+    directory = _cache_dir(path)
+    if directory is None:
+        return None
+    try:
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        columns = {col: np.load(os.path.join(directory, f'c{i}.npy'), mmap_mode='r')
+                   for i, col in enumerate(meta['columns'])}
+    except (OSError, ValueError, KeyError):
+        return None
+    os.utime(directory)
+    meta['time_origins'] = {col: pd.Timestamp(origin) for col, origin in meta['time_origins'].items()}
+    return pd.DataFrame(columns, copy=False), meta
+
+
+def filter_cache_file(path, col, cutoff, fs):
+    """Cache file of a filtered column (None if the file itself is not cached)"""
+    directory = _cache_dir(path)
+    if directory is None or not os.path.isdir(directory):
+        return None
+    # 'runs2': filtered run by run, gaps and runs too short to filter left empty (older
+    # versions interpolated the gaps, then kept the short runs unfiltered)
+    key = hashlib.sha1(f'{col}|{cutoff!r}|{fs!r}|runs2'.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f'filtre_{key}.npy')
+
+
+def write_table(columns, path):
+    """Write a dict of column arrays in the format given by the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npz':
+        # Text columns as fixed-width unicode so that no pickling is needed to reload
+        np.savez(path, **{str(col): (arr.astype(str) if arr.dtype == object else arr)
+                          for col, arr in columns.items()})
+        return
+    df = pd.DataFrame(columns, copy=False)
+    try:
+        if ext == '.parquet':
+            df.to_parquet(path, index=False, compression=PARQUET_COMPRESSION)
+        elif ext in ('.feather', '.arrow'):
+            df.to_feather(path, compression=PARQUET_COMPRESSION)
+        else:
+            # Compressed on the fly when the extension asks for it (.csv.gz...)
+            df.to_csv(path, index=False)
+    except ImportError:
+        if ext not in BINARY_FORMATS:
+            raise ValueError('le format .zst nécessite le module zstandard')
+        raise ValueError(f'le format {BINARY_FORMATS[ext]} nécessite le module pyarrow')
+
+
+def _read_binary_table(path):
+    """Read a Parquet, Feather or NPZ table (no text parsing)"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npz':
+        with np.load(path, allow_pickle=False) as data:
+            return pd.DataFrame({name: data[name] for name in data.files}, copy=False)
+    try:
+        if ext == '.parquet':
+            return pd.read_parquet(path)
+        return pd.read_feather(path)
+    except ImportError:
+        raise ValueError(f'le format {BINARY_FORMATS[ext]} nécessite le module pyarrow')
+
+
+def _read_csv_simple(path, usecols=None):
+    """Read a CSV with the detected format and convert its columns (raises on error).
+
+    usecols (list of names) restricts parsing to the columns of the file in it.
+    """
+    return _parse_csv(path, usecols)[0]
+
+
+def _parse_csv(path, usecols=None):
+    """Same as _read_csv_simple, also returning the time origins of the datetime columns"""
+    wanted = None if usecols is None else set(usecols).__contains__
+    if os.path.splitext(path)[1].lower() in BINARY_FORMATS:
+        df = _read_binary_table(path)
+        if wanted is not None:
+            df = df[[c for c in df.columns if wanted(c)]]
+        return df, _convert_columns(df)
+
+    sep, decimal_char, encoding = _sniff_csv_format(path)
+    if sep:
+        df = pd.read_csv(path, sep=sep, decimal=decimal_char, usecols=wanted, encoding=encoding)
+    else:
+        df = pd.read_csv(path, usecols=wanted, encoding=encoding)
+
+    # If df has only one column, retry with semicolon
+    if len(df.columns) <= 1 and sep != ';':
+        try:
+            retry = pd.read_csv(path, sep=';', decimal=',', usecols=wanted, encoding=encoding)
+            if len(retry.columns) > len(df.columns):
+                logger.warning('%s: relu avec le séparateur ";"', path)
+                df = retry
+        except Exception:
+            pass
+
+    return df, _convert_columns(df)
+
+
+def natural_key(path):
+    """Sort key ordering numbered files naturally (run_2 before run_10)"""
+    return [int(part) if part.isdigit() else part.lower()
+            for part in re.split(r'(\d+)', os.path.basename(path))]
+
+
+def _concat_segments(segments):
+    """Concatenate parsed segments (df, time_origins) on one continuous time base.
+
+    Datetime columns are re-based on the origin of the first segment; a
+    numeric first (time) column restarting in each file is shifted to follow
+    the previous segment. Each column is written once into a preallocated
+    array. Returns the DataFrame and the columns missing from some segments.
+    """
+    frames = [df for df, _ in segments]
+    columns = [c for c in frames[0].columns if all(c in df.columns for df in frames[1:])]
+    dropped = sorted({str(c) for df in frames for c in df.columns} - {str(c) for c in columns})
+    if not columns:
+        raise ValueError('aucune colonne commune aux segments')
+
+    # X offset of each segment, per column
+    offsets = [{} for _ in frames]
+    origins = segments[0][1]
+    for k, (_, seg_origins) in enumerate(segments):
+        for col, origin in seg_origins.items():
+            if col in origins:
+                offsets[k][col] = (origin - origins[col]).total_seconds()
+    time_col = columns[0]
+    if time_col not in origins and pd.api.types.is_numeric_dtype(frames[0][time_col]):
+        end = step = None
+        for k, df in enumerate(frames):
+            t = df[time_col].to_numpy(dtype=float)
+            if len(t) == 0:
+                continue
+            if len(t) > 1:
+                step = float(np.nanmedian(np.diff(t)))
+            if end is not None and t[0] <= end:
+                offsets[k][time_col] = end + (step or 0.0) - t[0]
+            end = t[-1] + offsets[k].get(time_col, 0.0)
+
+    bounds = np.concatenate(([0], np.cumsum([len(df) for df in frames])))
+    data = {}
+    for col in columns:
+        parts = [df[col].to_numpy() for df in frames]
+        dtype = np.result_type(*parts)
+        if any(off.get(col) for off in offsets):
+            dtype = np.result_type(dtype, float)
+        out = np.empty(bounds[-1], dtype=dtype)
+        for k, part in enumerate(parts):
+            dest = out[bounds[k]:bounds[k + 1]]
+            dest[:] = part
+            if offsets[k].get(col):
+                dest += offsets[k][col]
+        data[col] = out
+    return pd.DataFrame(data, copy=False), dropped
+
+
+def align_on_grid(x_ref, series, max_points=COMPARE_MAX_POINTS, offsets=None):
+    """Interpolate several (x, y) series on a common grid spanning x_ref.
+
+    offsets (one X shift per series) are applied to the small grid rather
+    than to the series, so shifted runs are never copied. Returns the grid
+    and a 2D array with one aligned row per series (NaN outside the X range
+    covered by a series).
+    """
+    x_ref = np.asarray(x_ref, dtype=float)
+    n_points = max(2, min(len(x_ref), max_points))
+    grid = np.linspace(np.nanmin(x_ref), np.nanmax(x_ref), n_points)
+    aligned = np.full((len(series), n_points), np.nan)
+    for i, (x, y) in enumerate(series):
+        offset = offsets[i] if offsets else 0.0
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        if not valid.all():
+            x, y = x[valid], y[valid]
+        if len(x) == 0:
+            continue
+        if np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind='stable')
+            x, y = x[order], y[order]
+        aligned[i] = np.interp(grid - offset, x, y, left=np.nan, right=np.nan)
+    return grid, aligned
+
+
+def visible_slice(x, x_sorted, xlim):
+    """Index range of a (sorted) X array covering xlim, plus one point each side"""
+    if not x_sorted:
+        return 0, len(x)
+    i0 = max(0, int(np.searchsorted(x, xlim[0], side='left')) - 1)
+    i1 = min(len(x), int(np.searchsorted(x, xlim[1], side='right')) + 1)
+    return i0, i1
+
+
+def minmax_decimate(x, y, n_bins):
+    """Reduce a series to the min and max of n_bins consecutive chunks.
+
+    Keeps the visual envelope of the signal (peaks are never dropped) with
+    about 2 * n_bins points, in the original order.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_bins <= 0 or n <= 2 * n_bins:
+        return x, y
+    chunk = n // n_bins
+    n_full = n // chunk
+    blocks = y[:chunk * n_full].reshape(n_full, chunk)
+    if np.isnan(blocks).any():
+        lo = np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1)
+        hi = np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1)
+    else:
+        lo = np.argmin(blocks, axis=1)
+        hi = np.argmax(blocks, axis=1)
+    pairs = np.sort(np.stack([lo, hi], axis=1), axis=1)
+    idx = (pairs + (np.arange(n_full) * chunk)[:, None]).ravel()
+    if chunk * n_full < n:
+        # Remainder shorter than a chunk: keep its last point
+        idx = np.append(idx, n - 1)
+    return x[idx], y[idx]
+
+
+def decimate_range(x, y, i0, i1, n_bins, max_points=None):
+    """Min/max decimation of x[i0:i1], y[i0:i1] for display.
+
+    With max_points, a wider range is first strided down to about max_points
+    samples: a cheap preview while panning/zooming (narrow peaks may be
+    missed until the full-quality redraw).
+    """
+    step = 1
+    if max_points and i1 - i0 > max_points:
+        step = -(-(i1 - i0) // max_points)
+    return minmax_decimate(x[i0:i1:step], y[i0:i1:step], n_bins)
+
+
+def estimate_lag(x_ref, y_ref, x, y, max_points=ALIGN_MAX_POINTS):
+    """Estimate the X shift to add to (x, y) so that it matches (x_ref, y_ref).
+
+    Both series are resampled on a uniform grid at the reference step and
+    cross-correlated with an FFT, O(n log n). Returns the shift (in X units)
+    and the correlation coefficient of the overlapping part once shifted.
+    """
+    x_ref = np.asarray(x_ref, dtype=float)
+    y_ref = np.asarray(y_ref, dtype=float)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dt = np.nanmedian(np.diff(x_ref))
+    if not dt > 0:
+        raise ValueError("l'axe X doit être croissant")
+    start = min(np.nanmin(x_ref), np.nanmin(x))
+    stop = max(np.nanmax(x_ref), np.nanmax(x))
+    n_points = int((stop - start) / dt) + 1
+    if n_points > max_points:
+        n_points = max_points
+        dt = (stop - start) / (n_points - 1)
+    grid = start + dt * np.arange(n_points)
+
+    def resample(xs, ys):
+        valid = ~(np.isnan(xs) | np.isnan(ys))
+        xs, ys = xs[valid], ys[valid]
+        if len(xs) < 2:
+            raise ValueError('pas assez de points valides')
+        if np.any(np.diff(xs) < 0):
+            order = np.argsort(xs, kind='stable')
+            xs, ys = xs[order], ys[order]
+        res = np.interp(grid, xs, ys, left=np.nan, right=np.nan)
+        # Zero mean, zero outside the covered range
+        res -= np.nanmean(res)
+        res[np.isnan(res)] = 0.0
+        return res
+
+    a = resample(x_ref, y_ref)
+    b = resample(x, y)
+    corr = signal.correlate(a, b, mode='full', method='fft')
+    lag = int(np.argmax(corr)) - (len(b) - 1)
+    # a[n + lag] ~ b[n]: b must be moved by +lag samples
+    shift = lag * dt
+
+    # Pearson coefficient over the overlap once shifted
+    if lag >= 0:
+        a_ov, b_ov = a[lag:], b[:len(b) - lag]
+    else:
+        a_ov, b_ov = a[:len(a) + lag], b[-lag:]
+    overlap = (a_ov != 0) & (b_ov != 0)
+    r = np.corrcoef(a_ov[overlap], b_ov[overlap])[0, 1] if overlap.sum() > 1 else np.nan
+    return shift, r
+
+
+def _runs(mask):
+    """Start and end (inclusive) indices of the True runs of a boolean array"""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return starts, ends
+
+
+class _ValidityMap:
+    """Valid (non-NaN) runs of a column, run-length encoded.
+
+    Built with a single pass over the column; filtering then works run by
+    run without scanning the data for NaN again. ends are exclusive.
+    """
+    def __init__(self, values=None, size=0, starts=(), ends=()):
+        if values is not None:
+            values = np.asarray(values)
+            size = len(values)
+            if values.dtype.kind == 'f':
+                starts, ends = _runs(~np.isnan(values))
+                ends = ends + 1
+            else:
+                starts, ends = ([0], [size]) if size else ([], [])
+        self.size = size
+        self.starts = np.asarray(starts, dtype=np.intp)
+        self.ends = np.asarray(ends, dtype=np.intp)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def n_valid(self):
+        return int((self.ends - self.starts).sum())
+
+    def slice(self, start=None, stop=None):
+        """Map of the rows [start, stop), without touching the column"""
+        start, stop, _ = slice(start, stop).indices(self.size)
+        stop = max(start, stop)
+        lo = int(np.searchsorted(self.ends, start, side='right'))
+        hi = int(np.searchsorted(self.starts, stop, side='left'))
+        return _ValidityMap(size=stop - start,
+                            starts=np.maximum(self.starts[lo:hi], start) - start,
+                            ends=np.minimum(self.ends[lo:hi], stop) - start)
+
+
+def find_events(y, threshold=None, flat_min_samples=2, prominence=None):
+    """Threshold crossings, peaks, flat lines and dropouts of a signal.
+
+    Returns (starts, ends, kinds) arrays, kinds indexing EVENT_KINDS.
+    """
+    y = np.asarray(y, dtype=float)
+    nan_mask = np.isnan(y)
+    starts, ends, kinds = [], [], []
+
+    if threshold is not None:
+        above = y > threshold
+        crossings = np.flatnonzero(above[1:] != above[:-1]) + 1
+        # Crossings next to a dropout are reported as dropouts only
+        crossings = crossings[~(nan_mask[crossings] | nan_mask[crossings - 1])]
+        starts.append(crossings)
+        ends.append(crossings)
+        kinds.append(np.where(above[crossings], 0, 1))
+
+    if not nan_mask.all():
+        y_min, y_max = np.nanmin(y), np.nanmax(y)
+        if prominence is None:
+            prominence = (y_max - y_min) * EVENT_PEAK_PROMINENCE
+        if prominence > 0:
+            peaks, _ = signal.find_peaks(np.where(nan_mask, y_min, y), prominence=prominence)
+            # Edges of a dropout are not peaks
+            neighbours = np.pad(nan_mask, 1)
+            peaks = peaks[~(neighbours[peaks] | neighbours[peaks + 2])]
+            starts.append(peaks)
+            ends.append(peaks)
+            kinds.append(np.full(len(peaks), 2))
+
+    # Flat lines: runs of identical consecutive samples
+    flat_starts, flat_ends = _runs(np.diff(y) == 0)
+    keep = (flat_ends - flat_starts + 2) >= flat_min_samples
+    starts.append(flat_starts[keep])
+    ends.append(flat_ends[keep] + 1)
+    kinds.append(np.full(int(keep.sum()), 3))
+
+    # Sensor dropouts: NaN runs
+    nan_starts, nan_ends = _runs(nan_mask)
+    starts.append(nan_starts)
+    ends.append(nan_ends)
+    kinds.append(np.full(len(nan_starts), 4))
+
+    return (np.concatenate(starts).astype(np.int64), np.concatenate(ends).astype(np.int64),
+            np.concatenate(kinds).astype(np.int8))
+
+
+class EventIndex:
+    """Events of one or more channels sorted by start index, searched in O(log n)"""
+    def __init__(self, per_channel):
+        starts, ends, kinds, channels = [], [], [], []
+        self.channel_names = []
+        for i, (name, (s, e, k)) in enumerate(per_channel):
+            self.channel_names.append(name)
+            starts.append(s)
+            ends.append(e)
+            kinds.append(k)
+            channels.append(np.full(len(s), i, dtype=np.int32))
+        self.starts = np.concatenate(starts) if starts else np.array([], dtype=np.int64)
+        order = np.argsort(self.starts, kind='stable')
+        self.starts = self.starts[order]
+        self.ends = np.concatenate(ends)[order] if ends else self.starts.copy()
+        self.kinds = np.concatenate(kinds)[order] if kinds else np.array([], dtype=np.int8)
+        self.channels = np.concatenate(channels)[order] if channels else np.array([], dtype=np.int32)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def next_after(self, index):
+        """Position of the first event starting at or after index (None if none)"""
+        pos = int(np.searchsorted(self.starts, index, side='left'))
+        return pos if pos < len(self.starts) else None
+
+    def previous_before(self, index):
+        """Position of the last event starting before index (None if none)"""
+        pos = int(np.searchsorted(self.starts, index, side='left')) - 1
+        return pos if pos >= 0 else None
+
+    def describe(self, pos):
+        return f'{EVENT_KINDS[self.kinds[pos]]} ({self.channel_names[self.channels[pos]]})'
+
+
+def _line_end_offset(path, n_lines):
+    """Return the byte offset just after the n-th line of a file (None if shorter)"""
+    if n_lines <= 0:
+        return 0
+    count = 0
+    offset = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                return None
+            newlines = block.count(b'\n')
+            if count + newlines >= n_lines:
+                pos = -1
+                for _ in range(n_lines - count):
+                    pos = block.index(b'\n', pos + 1)
+                return offset + pos + 1
+            count += newlines
+            offset += len(block)
+
+
+def _range_extras(y, dt, i0, i1, threshold, percentiles):
+    """Integral, percentiles and time above threshold over y[i0:i1 + 1] (O(k) on the range)"""
+    part = y[i0:i1 + 1]
+    steps = dt[i0:i1]
+    seg = (part[:-1] + part[1:]) * 0.5 * steps
+    result = {'integral': float(np.nansum(seg))}
+    for p, value in zip(percentiles, np.nanpercentile(part, percentiles)):
+        result[f'p{p}'] = value
+    if threshold is not None:
+        result['time_above'] = float(steps[part[:-1] > threshold].sum())
+    return result
+
+
+def _range_stats(y, dt, i0, i1, threshold=None, percentiles=(5, 50, 95)):
+    """Statistics over the inclusive index range [i0, i1], computed on the range itself.
+
+    dt: time step after each row (len(y) - 1 values, NaN steps as 0).
+    """
+    i0, i1 = max(0, int(i0)), min(len(y) - 1, int(i1))
+    part = y[i0:i1 + 1]
+    valid = part[~np.isnan(part)]
+    result = {'count': len(valid)}
+    if not len(valid):
+        return result
+    mean = valid.mean()
+    y_min, y_max = valid.min(), valid.max()
+    result.update({
+        'mean': mean,
+        'std': valid.std(),
+        'rms': np.sqrt(np.mean(valid * valid)),
+        'min': y_min,
+        'max': y_max,
+        'ptp': y_max - y_min,
+    })
+    result.update(_range_extras(y, dt, i0, i1, threshold, percentiles))
+    return result
+
+
+class _RangeStats:
+    """Precomputed tables answering range statistics on one column in O(1).
+
+    Prefix sums give mean, std and RMS of any index range in constant time.
+    Min/max use per-block extrema indexed by a sparse table, so a query scans
+    at most two partial blocks. The integral, percentiles and time above a
+    threshold are computed on the selected range (see _range_extras); dt is
+    the time step array shared by every column of the dataset.
+    """
+    BLOCK = 1024
+
+    def __init__(self, y, dt):
+        y = np.asarray(y, dtype=float)
+        self.y = y
+        self._dt = dt
+        valid = ~np.isnan(y)
+        self._has_nan = not valid.all()
+        # Center before accumulating to limit cancellation in the variance
+        self._offset = float(np.nanmean(y)) if valid.any() else 0.0
+        y0 = np.where(valid, y - self._offset, 0.0)
+        self._count = np.concatenate(([0], np.cumsum(valid))) if self._has_nan else None
+        self._sum = np.concatenate(([0.0], np.cumsum(y0)))
+        y0 *= y0
+        self._sum2 = np.concatenate(([0.0], np.cumsum(y0)))
+        del y0
+
+        # Sparse tables over block extrema
+        starts = np.arange(0, len(y), self.BLOCK)
+        self._min_table = [np.fmin.reduceat(y, starts)] if len(y) else [np.array([])]
+        self._max_table = [np.fmax.reduceat(y, starts)] if len(y) else [np.array([])]
+        k = 1
+        while (1 << k) <= len(starts):
+            half = 1 << (k - 1)
+            prev_min, prev_max = self._min_table[-1], self._max_table[-1]
+            self._min_table.append(np.fmin(prev_min[:-half], prev_min[half:]))
+            self._max_table.append(np.fmax(prev_max[:-half], prev_max[half:]))
+            k += 1
+
+    def _extrema(self, i0, i1):
+        """Min and max over y[i0:i1 + 1], ignoring NaN"""
+        b0, b1 = i0 // self.BLOCK, i1 // self.BLOCK
+        if b1 - b0 <= 1:
+            part = self.y[i0:i1 + 1]
+            return np.fmin.reduce(part), np.fmax.reduce(part)
+        left = self.y[i0:(b0 + 1) * self.BLOCK]
+        right = self.y[b1 * self.BLOCK:i1 + 1]
+        lo, hi = b0 + 1, b1 - 1
+        k = (hi - lo + 1).bit_length() - 1
+        mins = (np.fmin.reduce(left), np.fmin.reduce(right),
+                self._min_table[k][lo], self._min_table[k][hi - (1 << k) + 1])
+        maxs = (np.fmax.reduce(left), np.fmax.reduce(right),
+                self._max_table[k][lo], self._max_table[k][hi - (1 << k) + 1])
+        return np.fmin.reduce(mins), np.fmax.reduce(maxs)
+
+    def stats(self, i0, i1, threshold=None, percentiles=(5, 50, 95)):
+        """Statistics over the inclusive index range [i0, i1]"""
+        i0, i1 = max(0, int(i0)), min(len(self.y) - 1, int(i1))
+        count = (self._count[i1 + 1] - self._count[i0]) if self._has_nan else (i1 - i0 + 1)
+        result = {'count': int(count)}
+        if count == 0:
+            return result
+        total = self._sum[i1 + 1] - self._sum[i0]
+        total2 = self._sum2[i1 + 1] - self._sum2[i0]
+        centered_mean = total / count
+        var = max(total2 / count - centered_mean * centered_mean, 0.0)
+        mean = self._offset + centered_mean
+        y_min, y_max = self._extrema(i0, i1)
+        result.update({
+            'mean': mean,
+            'std': np.sqrt(var),
+            'rms': np.sqrt(var + mean * mean),
+            'min': y_min,
+            'max': y_max,
+            'ptp': y_max - y_min,
+        })
+        result.update(_range_extras(self.y, self._dt, i0, i1, threshold, percentiles))
+        return result
+
+
+class ColumnBuffer:
+    """Growable columnar storage: appends cost O(new rows) amortized.
+
+    Arrays are over-allocated and only the first ``size`` rows are valid, so
+    views returned by ``view`` never copy the data.
+    """
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.size = len(df)
+        self.capacity = max(1024, int(self.size * 1.25))
+        self._arrays = {}
+        for col in self.columns:
+            values = df[col].to_numpy()
+            arr = np.empty(self.capacity, dtype=values.dtype)
+            arr[:self.size] = values
+            self._arrays[col] = arr
+        self._index = np.arange(self.capacity)
+
+    def _grow(self, needed):
+        new_capacity = max(needed, int(self.capacity * 1.5))
+        for col, arr in self._arrays.items():
+            new_arr = np.empty(new_capacity, dtype=arr.dtype)
+            new_arr[:self.size] = arr[:self.size]
+            self._arrays[col] = new_arr
+        self._index = np.arange(new_capacity)
+        self.capacity = new_capacity
+
+    def append(self, df):
+        n = len(df)
+        if n == 0:
+            return
+        if self.size + n > self.capacity:
+            self._grow(self.size + n)
+        for col, arr in self._arrays.items():
+            values = df[col].to_numpy() if col in df.columns else np.full(n, np.nan)
+            if not np.can_cast(values.dtype, arr.dtype, casting='same_kind'):
+                # e.g. NaN appended to an integer column: upcast once
+                new_arr = np.empty(self.capacity, dtype=np.result_type(arr.dtype, values.dtype))
+                new_arr[:self.size] = arr[:self.size]
+                self._arrays[col] = arr = new_arr
+            arr[self.size:self.size + n] = values
+        self.size += n
+
+    def add_column(self, col, values):
+        arr = np.empty(self.capacity, dtype=np.asarray(values).dtype)
+        arr[:self.size] = values
+        self._arrays[col] = arr
+        self.columns.append(col)
+
+    def drop_column(self, col):
+        if col in self._arrays:
+            del self._arrays[col]
+            self.columns.remove(col)
+
+    def view(self, col):
+        return self._arrays[col][:self.size]
+
+    def index_view(self):
+        return self._index[:self.size]
+
+    def to_frame(self):
+        return pd.DataFrame({col: arr[:self.size] for col, arr in self._arrays.items()})
+
+
+def _compressed_size(sample, compression):
+    """Size of a sample once compressed like its file (None if not compressed)"""
+    if compression in ('gzip', 'zip'):
+        return len(zlib.compress(sample, 6))
+    if compression == 'bz2':
+        return len(bz2.compress(sample))
+    if compression == 'xz':
+        return len(lzma.compress(sample))
+    if compression == 'zstd':
+        # Available: the sample itself was read with it
+        import zstandard
+        return len(zstandard.ZstdCompressor().compress(sample))
+    return None
+
+
+def _estimate_frame_bytes(path, n_columns, sample_size=1 << 16):
+    """Rough size in memory of n_columns float columns of a CSV, from its first bytes"""
+    file_size = os.path.getsize(path)
+    if os.path.splitext(path)[1].lower() in BINARY_FORMATS:
+        # Binary tables: at least their size on disk
+        return file_size
+    sample = _read_head(path, sample_size)
+    compressed_size = _compressed_size(sample, file_compression(path))
+    if compressed_size:
+        # Compressed file: text size from the compression ratio of its first bytes
+        file_size = file_size * len(sample) // compressed_size
+    lines = max(1, sample.count(b'\n'))
+    return int(file_size / (len(sample) / lines) * n_columns * 8) if sample else 0
+
+
+class _ColumnStore:
+    """Read-only columnar storage of a parsed file.
+
+    Columns are kept as 1-D views of the parsed DataFrame blocks (no copy);
+    the DataFrame itself is not kept. Supports the subset of the DataFrame
+    interface used by derived channels (``columns``, ``[]``, ``len``).
+    """
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.size = len(df)
+        self._arrays = {col: df[col].to_numpy() for col in self.columns}
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, col):
+        return pd.Series(self._arrays[col], copy=False)
+
+    def __setitem__(self, col, values):
+        if col not in self._arrays:
+            self.columns.append(col)
+        self._arrays[col] = np.asarray(values)
+
+    def view(self, col):
+        return self._arrays[col]
+
+    def index_view(self):
+        return np.arange(self.size)
+
+    @property
+    def nbytes(self):
+        # Several columns may share one parsed block: count each buffer once
+        buffers = {}
+        for arr in self._arrays.values():
+            base = arr
+            while isinstance(base.base, np.ndarray):
+                base = base.base
+            buffers[id(base)] = base.nbytes
+        return sum(buffers.values())
+
+
+def load_comparison_runs(paths, columns, required=(), definitions=None, used=0,
+                         budget=COMPARE_MEMORY_BUDGET):
+    """Read comparison runs into column stores within a memory budget.
+
+    Only the given columns (those of the main file) are parsed, concurrently;
+    files that would exceed the budget (used bytes already held) are refused
+    before parsing from their estimated size. Runs must provide the required
+    columns, directly or as derived channels of definitions. Returns the
+    [(path, _ColumnStore)] read, the bytes then used and the error messages.
+    """
+    columns = list(columns)
+    errors = []
+    accepted = []
+    estimated = used
+    for path in paths:
+        try:
+            estimate = _estimate_frame_bytes(path, len(columns))
+        except (OSError, EOFError, ValueError, lzma.LZMAError, zipfile.BadZipFile) as e:
+            # Unreadable or corrupt archive, ZIP of several files, .zst without zstandard
+            errors.append(f"{os.path.basename(path)} : {e}")
+            continue
+        if estimated + estimate > budget:
+            errors.append(f"{os.path.basename(path)} : budget mémoire dépassé "
+                          f"(~{(estimated + estimate) / 2**20:.0f} Mo pour {budget / 2**20:.0f} Mo autorisés)")
+            continue
+        estimated += estimate
+        accepted.append(path)
+
+    # Parse the runs concurrently (the C parser releases the GIL)
+    loaded = []
+    with ThreadPoolExecutor(max_workers=max(1, min(len(accepted), os.cpu_count() or 1))) as pool:
+        futures = [(path, pool.submit(_read_csv_simple, path, columns)) for path in accepted]
+        for path, future in futures:
+            try:
+                df = future.result()
+            except Exception as e:
+                errors.append(f"{os.path.basename(path)} : {e}")
+                continue
+            if df.empty:
+                errors.append(f"{os.path.basename(path)} : fichier vide")
+                continue
+            loaded.append((path, df))
+
+    # Runs must at least provide the displayed columns
+    required = {c for c in required if c and c != 'Index'}
+    runs = []
+    for path, df in loaded:
+        missing = required - set(df.columns) - set(derivable_channels(df.columns, definitions or {}))
+        if missing:
+            errors.append(f"{os.path.basename(path)} : colonnes manquantes {', '.join(sorted(missing))}")
+            continue
+        store = _ColumnStore(df)
+        del df
+        if used + store.nbytes > budget:
+            errors.append(f"{os.path.basename(path)} : budget mémoire dépassé "
+                          f"({(used + store.nbytes) / 2**20:.0f} Mo pour {budget / 2**20:.0f} Mo autorisés)")
+            continue
+        used += store.nbytes
+        runs.append((path, store))
+    return runs, used, errors
+
+
+def sampling_frequency(df, default=1000.0):
+    """Sampling frequency (Hz) from the mean step of the first (time) column"""
+    try:
+        if len(df) > 1:
+            mean_time_diff = np.mean(np.diff(df.iloc[:, 0]))
+            if mean_time_diff > 0:
+                return 1.0 / mean_time_diff
+    except Exception:
+        pass
+    return default
+
+
+def time_base(df, fs):
+    """Time of each row: the first column if numeric, else index / fs"""
+    first = df.iloc[:, 0]
+    if pd.api.types.is_numeric_dtype(first):
+        return first.to_numpy(dtype=float)
+    return np.arange(len(df)) / fs
+
+
+def _butter_lowpass(cutoff, fs, order=4):
+    """(b, a) coefficients of a Butterworth low-pass filter (cutoff clamped below Nyquist)"""
+    if cutoff <= 0:
+        raise ValueError('la fréquence de coupure doit être positive')
+    normalized_cutoff = min(cutoff / (fs / 2), 0.99)
+    return signal.butter(order, normalized_cutoff, btype='low')
+
+
+def _impulse_response_length(b, a, tol=1e-6):
+    """Samples for the impulse response of a stable IIR filter to decay below tol"""
+    radius = np.max(np.abs(np.roots(a))) if len(a) > 1 else 0.0
+    if radius <= 0:
+        return len(b)
+    return int(np.ceil(np.log(tol) / np.log(radius))) + len(b)
+
+
+def lowpass_filter(values, cutoff, fs, order=4, validity=None):
+    """Zero-phase Butterworth low-pass filter, applied to each valid run separately.
+
+    NaN gaps stay NaN instead of being bridged by the filter. Runs too short
+    for filtfilt can't be filtered and are set to NaN too (a warning gives
+    their number of samples). validity: _ValidityMap of values (computed
+    here if None).
+    """
+    b, a = _butter_lowpass(cutoff, fs, order)
+    y = np.array(values, dtype=float)
+    if validity is None:
+        validity = _ValidityMap(y)
+    # filtfilt needs more samples than its edge padding
+    long_runs = validity.ends - validity.starts > 3 * max(len(a), len(b))
+    for start, end in zip(validity.starts[long_runs], validity.ends[long_runs]):
+        y[start:end] = signal.filtfilt(b, a, y[start:end])
+    if not long_runs.all():
+        starts, ends = validity.starts[~long_runs], validity.ends[~long_runs]
+        # Short runs can be numerous on sparse data: mask them without a Python loop
+        edges = np.zeros(len(y) + 1, dtype=np.int8)
+        edges[starts] = 1
+        edges[ends] = -1
+        y[np.cumsum(edges[:-1], dtype=np.int8) > 0] = np.nan
+        logger.warning('filtre passe-bas : %d échantillons dans des portions trop courtes laissés vides',
+                       int((ends - starts).sum()))
+    return y
+
+
+def unfiltered_samples(raw, filtered):
+    """Samples of raw left empty by lowpass_filter (valid runs too short to be filtered)"""
+    return int(np.count_nonzero(np.isnan(filtered) & ~np.isnan(np.asarray(raw, dtype=float))))
+
+
+def lowpass_window(values, cutoff, fs, start, stop, order=4, validity=None):
+    """lowpass_filter of the rows [start, stop) only.
+
+    The rows are filtered with a margin on each side as long as the impulse
+    response of the filter, which absorbs the edge transients: the result
+    matches the whole-column filter while the cost only depends on the
+    window. validity: _ValidityMap of the whole values.
+    """
+    pad = _impulse_response_length(*_butter_lowpass(cutoff, fs, order))
+    lo = max(0, start - pad)
+    hi = min(len(values), stop + pad)
+    runs = validity.slice(lo, hi) if validity is not None else None
+    return lowpass_filter(values[lo:hi], cutoff, fs, order, validity=runs)[start - lo:stop - lo]
+
+
+def _resample_ratio(fs, target_fs):
+    """(up, down) with fs * up / down close to target_fs, for a rate reduction"""
+    if not 0 < target_fs < fs:
+        raise ValueError(f'la fréquence cible doit être comprise entre 0 et {fs:g} Hz')
+    max_down = max(RESAMPLE_MAX_DENOMINATOR, int(np.ceil(fs / target_fs)))
+    ratio = Fraction(target_fs / fs).limit_denominator(max_down)
+    return ratio.numerator, ratio.denominator
+
+
+def resample_columns(columns, fs, target_fs):
+    """Anti-aliased resampling of a dict of column arrays (first column: time) at about target_fs.
+
+    Numeric columns go through a polyphase filter (resample_poly: FIR
+    low-pass at the new Nyquist frequency, then decimation); NaN gaps are
+    bridged for the filter only and stay NaN in the result. The first
+    column, if numeric, is interpolated at the new sample positions; other
+    columns take the value of the preceding row. Returns (columns, rate).
+    """
+    up, down = _resample_ratio(fs, target_fs)
+    names = list(columns)
+    n = len(columns[names[0]])
+    n_out = -(-n * up // down)
+    # Position of every output sample on the input rows
+    position = np.arange(n_out) * (down / up)
+    source = np.minimum(position.astype(np.intp), n - 1)
+    resampled = {}
+    for i, name in enumerate(names):
+        values = np.asarray(columns[name])
+        if values.dtype.kind not in 'iuf':
+            resampled[name] = values[source]
+        elif i == 0:
+            resampled[name] = np.interp(position, np.arange(n), values)
+        else:
+            y = np.array(values, dtype=float)
+            gaps = np.isnan(y)
+            if gaps.all():
+                resampled[name] = np.full(n_out, np.nan)
+                continue
+            if gaps.any():
+                valid = np.flatnonzero(~gaps)
+                y[gaps] = np.interp(np.flatnonzero(gaps), valid, y[valid])
+            y = signal.resample_poly(y, up, down, padtype='line')
+            y[gaps[source]] = np.nan
+            resampled[name] = y
+    return resampled, fs * up / down
+
+
+def export_columns(df, start=None, stop=None, cutoff=None, fs=None, rolling=None, validity=None,
+                   target_fs=None):
+    """Columns to export for the rows [start, stop), as a dict of arrays.
+
+    The rows are views on df. With cutoff (Hz), a ``{col}_filtré`` column is
+    added for every numeric column but the first (time), the columns being
+    filtered in parallel; with rolling = (samples, operator, suffix), a
+    ``{col}_{suffix}_glissant`` column. validity: function giving the
+    _ValidityMap of a whole column (maps computed on the rows if None).
+    With target_fs (Hz), every column is then resampled (resample_columns).
+    """
+    exported = {col: df[col].to_numpy()[start:stop] for col in df.columns}
+    numeric_cols = [c for c in list(exported)[1:] if exported[c].dtype.kind in 'iuf']
+    if cutoff is not None and numeric_cols:
+        def filtered(col):
+            runs = validity(col).slice(start, stop) if validity is not None else None
+            return lowpass_filter(exported[col], cutoff, fs, validity=runs)
+
+        with ThreadPoolExecutor(max_workers=min(len(numeric_cols), os.cpu_count() or 1)) as pool:
+            for col, y in zip(numeric_cols, pool.map(filtered, numeric_cols)):
+                exported[f'{col}_filtré'] = y
+    if rolling is not None:
+        n, op, suffix = rolling
+        for col in numeric_cols:
+            exported[f'{col}_{suffix}_glissant'] = rolling_window(exported[col], n, op)
+    if target_fs is not None:
+        exported, _ = resample_columns(exported, fs, target_fs)
+    return exported
+
+
+class Dataset:
+    """A loaded measurement file, usable without the GUI::
+
+        ds = Dataset.load('essai.csv')
+        ds.columns
+        ds.column('Effort Z1 (N)', 1000, 2000)
+        ds.lowpass('Effort Z1 (N)', 10.0)
+        ds.stats('Effort Z1 (N)', 1000, 2000, threshold=50.0)
+        ds.export('extrait.parquet', 1000, 2000, cutoff=10.0)
+
+    Row ranges are [start, stop) as for Python slices. Derived channels are
+    the built-in ones unless derived_defs ({name: expression}) is given; the
+    definitions saved by the GUI are read by load_derived_definitions.
+    """
+    def __init__(self, df, path=None, raw_columns=None, time_origins=None, csv_format=None, derived_defs=None):
+        self.df = df
+        self.path = path
+        self.raw_columns = list(raw_columns) if raw_columns is not None else list(df.columns)
+        self.time_origins = time_origins or {}
+        # Separator, decimal, encoding, columns and time origins of a text file read by
+        # the C parser (None otherwise), used to parse rows appended later
+        self.csv_format = csv_format
+        self.bad_lines_skipped = False
+        self.dropped_columns = []
+        self.sampling_frequency = sampling_frequency(df)
+        self.derived_defs = dict(BUILTIN_DERIVED if derived_defs is None else derived_defs)
+        self._stats = {}
+        self._dt = None
+        self._validity = {}
+
+    @classmethod
+    def load(cls, path, use_cache=False, target_fs=None, derived_defs=None):
+        """Read a CSV (format and encoding detected) or binary table (raises on error).
+
+        With use_cache, the parsed columns of a large text file are memory-mapped
+        from ~/.courbecsv/cache, or saved there in the background. With
+        target_fs (Hz), the data is resampled once read (see resample).
+        """
+        df = None
+        last_err = None
+        size_before = os.path.getsize(path)
+        # Separator/decimal/encoding actually used by the C parser (None for python engine fallbacks and binary tables)
+        read_format = None
+        bad_lines_skipped = False
+
+        cached = _load_parsed_cache(path) if use_cache else None
+        if cached is not None:
+            # This exact file version was parsed before: memory-map its columns
+            df, cache_meta = cached
+            read_format = cache_meta['read_format']
+        elif os.path.splitext(path)[1].lower() in BINARY_FORMATS:
+            # Binary tables are loaded as they are, without text parsing
+            df = _read_binary_table(path)
+        else:
+            # Try reading the CSV with several fallbacks to handle different delimiters
+            # First, try to sniff delimiter and encoding (the C parser handles every encoding)
+            sep, decimal_char, encoding = _sniff_csv_format(path)
+
+            # Try reading with detected separator
+            try:
+                if sep:
+                    df = pd.read_csv(path, sep=sep, decimal=decimal_char, encoding=encoding)
+                    read_format = (sep, decimal_char, encoding)
+                else:
+                    df = pd.read_csv(path, encoding=encoding)
+                    read_format = (',', '.', encoding)
+            except Exception as e:
+                last_err = e
+
+            # If df has only one column, it might have been parsed incorrectly - retry with semicolon
+            if df is not None and len(df.columns) == 1 and ';' in df.columns[0]:
+                logger.warning('%s: une seule colonne lue, nouvel essai avec le séparateur ";"', path)
+                try:
+                    df = pd.read_csv(path, sep=';', decimal=',', encoding=encoding)
+                    read_format = (';', ',', encoding)
+                except Exception as e:
+                    last_err = e
+                    df = None
+
+            # Final fallback: use python engine with auto-detection (about 10x slower)
+            if df is None:
+                read_format = None
+                logger.warning('%s: échec du parseur C (%s), repli sur le moteur python', path, last_err)
+                start = time.perf_counter()
+                try:
+                    df = pd.read_csv(path, sep=None, engine='python', decimal=decimal_char, encoding=encoding)
+                except Exception as e2:
+                    # Final attempt: skip bad lines
+                    logger.warning('%s: échec du moteur python (%s), lignes malformées ignorées', path, e2)
+                    df = pd.read_csv(path, sep=None, engine='python', on_bad_lines='skip', encoding=encoding)
+                    bad_lines_skipped = True
+                logger.warning('%s: lu par le moteur python en %.2f s', path, time.perf_counter() - start)
+
+        if cached is not None:
+            raw_columns = cache_meta['raw_columns']
+            time_origins = cache_meta['time_origins']
+        else:
+            raw_columns = list(df.columns)
+
+            # Convert datetime columns to seconds (relative to first value) and French decimals
+            time_origins = _convert_columns(df)
+
+            # Cache the parsed columns of large text files in the background
+            if use_cache and read_format is not None and size_before >= CACHE_MIN_BYTES and not df.empty:
+                meta = {'read_format': list(read_format), 'raw_columns': [str(c) for c in raw_columns],
+                        'time_origins': time_origins}
+                threading.Thread(target=_save_parsed_cache, args=(path, df.copy(deep=False), meta),
+                                 daemon=True).start()
+
+        # Remember how the file was parsed so that appended rows can be read the same way
+        # (not for compressed files: appended bytes can't be decompressed alone)
+        csv_format = None
+        if read_format is not None and file_compression(path) is None:
+            csv_format = {
+                'sep': read_format[0],
+                'decimal': read_format[1],
+                'encoding': read_format[2],
+                'columns': raw_columns,
+                'time_origins': time_origins,
+                # Byte offset of the parsed content, only trusted if the file did not grow meanwhile
+                'offset': size_before if os.path.getsize(path) == size_before else None,
+            }
+        dataset = cls(df, path, raw_columns, time_origins, csv_format, derived_defs)
+        dataset.bad_lines_skipped = bad_lines_skipped
+        if target_fs is not None:
+            dataset.resample(target_fs)
+        return dataset
+
+    @classmethod
+    def load_segments(cls, paths, max_workers=None, derived_defs=None):
+        """Read split segments in worker processes and concatenate them (see _concat_segments)"""
+        paths = sorted(paths, key=natural_key)
+        segments = []
+        errors = []
+        # One worker process per segment (parsing and datetime conversion hold the GIL)
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(paths), os.cpu_count() or 1)) as pool:
+            futures = [(path, pool.submit(_parse_csv, path)) for path in paths]
+            for path, future in futures:
+                try:
+                    segments.append(future.result())
+                except Exception as e:
+                    errors.append(f"{os.path.basename(path)} : {e}")
+        if errors:
+            raise ValueError('\n'.join(errors))
+        df, dropped = _concat_segments(segments)
+        dataset = cls(df, paths[0], derived_defs=derived_defs)
+        dataset.dropped_columns = dropped
+        return dataset
+
+    def resample(self, target_fs):
+        """Replace the data by its anti-aliased resampling at about target_fs (see resample_columns)"""
+        columns, fs = resample_columns({col: self.df[col].to_numpy() for col in self.df.columns},
+                                       self.sampling_frequency, target_fs)
+        self.set_data(pd.DataFrame(columns, copy=False))
+        self.sampling_frequency = fs
+        # Rows appended to the file could not be resampled consistently
+        self.csv_format = None
+        return self
+
+    @classmethod
+    def load_preview(cls, path, max_rows=PREVIEW_ROWS):
+        """About max_rows lines evenly spread over a large CSV, read by seeking.
+
+        The index of the preview rows is their estimated row number in the
+        file and sampling_frequency is estimated for the whole file. Returns
+        None when a full load is fast anyway or the file can't be sampled by
+        bytes (small, binary, compressed, cached or UTF-16 file).
+        """
+        size = os.path.getsize(path)
+        cache = _cache_dir(path)
+        ext = os.path.splitext(path)[1].lower()
+        if (size < PREVIEW_MIN_BYTES or ext in BINARY_FORMATS or ext in COMPRESSED_FORMATS
+                or (cache is not None and os.path.isdir(cache))):
+            return None
+        sep, decimal_char, encoding = _sniff_csv_format(path)
+        if encoding.startswith('utf-16'):
+            return None
+
+        lines = []
+        offsets = []
+        with open(path, 'rb', buffering=0) as f:
+            head = f.read(1 << 16)
+            data_start = head.index(b'\n') + 1
+            # Enough bytes to skip a partial line and read a whole one
+            chunk = 4 * max((len(line) for line in head[data_start:].split(b'\n')), default=256) + 2
+            step = max(chunk, (size - data_start) // max_rows)
+            for offset in range(data_start, size, step):
+                f.seek(offset)
+                buf = f.read(chunk)
+                begin = 0 if offset == data_start else buf.find(b'\n') + 1
+                end = buf.find(b'\n', begin)
+                if (begin == 0 and offset > data_start) or end < 0 or not buf[begin:end].strip():
+                    continue
+                lines.append(buf[begin:end + 1])
+                offsets.append(offset + begin)
+
+        text = head[:data_start] + b''.join(lines)
+        if sep:
+            df = pd.read_csv(io.BytesIO(text), sep=sep, decimal=decimal_char, encoding=encoding)
+        else:
+            df = pd.read_csv(io.BytesIO(text), encoding=encoding)
+        if len(df) != len(offsets):
+            return None
+        raw_columns = list(df.columns)
+        time_origins = _convert_columns(df)
+
+        # Row numbers from the mean length of the sampled lines
+        line_length = sum(len(line) for line in lines) / max(len(lines), 1)
+        rows = ((np.asarray(offsets) - data_start) / line_length).astype(np.int64)
+        df.index = rows
+        dataset = cls(df, path, raw_columns, time_origins)
+        dataset.estimated_rows = int((size - data_start) / line_length)
+        first = df.iloc[:, 0]
+        if len(df) > 1 and pd.api.types.is_numeric_dtype(first) and first.iloc[-1] > first.iloc[0]:
+            dataset.sampling_frequency = (rows[-1] - rows[0]) / (first.iloc[-1] - first.iloc[0])
+        return dataset
+
+    @property
+    def columns(self):
+        """File columns followed by the derived channels computable from them"""
+        cols = list(self.df.columns)
+        return cols + [c for c in derivable_channels(cols, self.derived_defs) if c not in cols]
+
+    def column(self, name, start=None, stop=None):
+        """Values of a column (computing a derived channel if needed), as a view"""
+        if not materialize_derived(self.df, self.derived_defs, name):
+            raise KeyError(name)
+        return self.df[name].to_numpy()[start:stop]
+
+    def validity(self, name):
+        """Valid runs of a column (see _ValidityMap), computed once"""
+        validity = self._validity.get(name)
+        if validity is None:
+            validity = _ValidityMap(self.column(name))
+            self._validity[name] = validity
+        return validity
+
+    def set_data(self, df):
+        """Replace the rows (e.g. by the rows appended in follow mode), dropping the per-column tables"""
+        self.df = df
+        self._stats = {}
+        self._dt = None
+        self._validity = {}
+
+    def forget(self, name):
+        """Drop a computed derived column and its tables"""
+        if name in self.df.columns:
+            self.df.drop(columns=[name], inplace=True)
+        self._stats.pop(name, None)
+        self._validity.pop(name, None)
+
+    def follow_start(self):
+        """Number of complete rows read and byte offset where their lines end.
+
+        Rows appended to the file later are read from this offset (see
+        read_appended). Raises ValueError when the file can't be followed.
+        """
+        fmt = self.csv_format
+        if fmt is None:
+            raise ValueError("le format de ce fichier n'a pas pu être détecté de façon fiable")
+        n_rows = len(self.df)
+        offset = fmt['offset']
+        ends_with_newline = False
+        if offset is not None and offset > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(offset - 1)
+                ends_with_newline = f.read(1) == b'\n'
+        if offset is None or not ends_with_newline:
+            # The file grew during parsing or ends with a partial row: drop the
+            # partial row and find where the complete rows end (header + rows)
+            if not ends_with_newline and offset is not None and n_rows > 0:
+                n_rows -= 1
+            offset = _line_end_offset(self.path, 1 + n_rows)
+            if offset is None:
+                raise ValueError('fin des données introuvable')
+        return n_rows, offset
+
+    def read_appended(self, offset, columns=()):
+        """Parse the complete rows appended to the file after byte offset.
+
+        Derived channels among columns are computed on the new rows only, so
+        they must not use HISTORY_FUNCTIONS (see uses_history). Returns the
+        new rows (None if there are none yet) and the offset to read from next.
+        """
+        size = os.path.getsize(self.path)
+        if size < offset:
+            raise ValueError('le fichier a été tronqué ou remplacé')
+        if size == offset:
+            return None, offset
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read(size - offset)
+        # Keep a partially written last line for the next poll
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            return None, offset
+        chunk = chunk[:end + 1]
+        offset += len(chunk)
+
+        fmt = self.csv_format
+        new_df = pd.read_csv(io.BytesIO(chunk), sep=fmt['sep'], decimal=fmt['decimal'],
+                             header=None, names=fmt['columns'], encoding=fmt['encoding'])
+        if new_df.empty:
+            return None, offset
+        _convert_columns(new_df, fmt['time_origins'])
+        for col in columns:
+            if col not in new_df.columns:
+                materialize_derived(new_df, self.derived_defs, col)
+        return new_df, offset
+
+    def lowpass(self, name, cutoff, start=None, stop=None, order=4):
+        return lowpass_filter(self.column(name, start, stop), cutoff, self.sampling_frequency, order,
+                              validity=self.validity(name).slice(start, stop))
+
+    def _time_steps(self):
+        """Time step after each row (NaN steps as 0), shared by the statistics of every column"""
+        if self._dt is None:
+            dt = np.diff(time_base(self.df, self.sampling_frequency))
+            dt[np.isnan(dt)] = 0.0
+            self._dt = dt
+        return self._dt
+
+    def stats(self, name, start=0, stop=None, threshold=None, percentiles=(5, 50, 95), keep_tables=False):
+        """Range statistics of a column over [start, stop).
+
+        keep_tables: build the column's prefix tables (see _RangeStats) for
+        repeated queries, kept for the STATS_TABLE_COLUMNS last columns;
+        otherwise the statistics are computed on the range only.
+        """
+        stop = len(self.df) if stop is None else stop
+        stats = self._stats.pop(name, None)
+        if stats is None and not keep_tables:
+            return _range_stats(np.asarray(self.column(name), dtype=float), self._time_steps(),
+                                start, stop - 1, threshold=threshold, percentiles=percentiles)
+        if stats is None:
+            stats = _RangeStats(self.column(name), self._time_steps())
+        # Most recently used last
+        self._stats[name] = stats
+        while len(self._stats) > STATS_TABLE_COLUMNS:
+            del self._stats[next(iter(self._stats))]
+        return stats.stats(start, stop - 1, threshold=threshold, percentiles=percentiles)
+
+    def export(self, path, start=None, stop=None, cutoff=None, rolling=None, target_fs=None):
+        """Write rows [start, stop) with every derived channel (format from the extension).
+
+        Returns the number of rows written.
+        """
+        for name in derivable_channels(self.df.columns, self.derived_defs):
+            materialize_derived(self.df, self.derived_defs, name)
+        exported = export_columns(self.df, start, stop, cutoff, self.sampling_frequency, rolling,
+                                  validity=self.validity, target_fs=target_fs)
+        write_table(exported, path)
+        return len(next(iter(exported.values())))
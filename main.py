@@ -1,29 +1,87 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import pandas as pd
-import csv
-import re
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future
+import time
 import numpy as np
-from scipy import signal
 import matplotlib
 matplotlib.use('TkAgg')
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
 
-# Modern color scheme - Light theme
-COLORS = {
-    'bg_dark': '#f5f5f5',
-    'bg_medium': '#ffffff',
-    'bg_light': '#e8e8e8',
-    'accent': '#2196F3',
-    'accent_hover': '#1976D2',
-    'text': '#333333',
-    'text_muted': '#666666',
-    'success': '#4CAF50',
-    'warning': '#FF9800',
-    'border': '#d0d0d0'
-}
+from csv_core import (
+    BUILTIN_DERIVED, COMPARE_MEMORY_BUDGET, EVENT_KINDS, EXPRESSION_FUNCTIONS, HISTORY_FUNCTIONS,
+    ROLLING_OPERATORS, SESSION_FILE, SETTINGS_DIR, ColumnBuffer, Dataset, DerivedExpression, EventIndex,
+    align_on_grid, column_signature, decimate_range, derivable_channels, estimate_lag, export_columns,
+    file_compression, file_stem, filter_cache_file, find_events, load_comparison_runs,
+    load_derived_definitions, lowpass_filter, lowpass_window, materialize_derived, minmax_decimate,
+    natural_key, prune_cache, rolling_window, save_derived_definitions, unfiltered_samples, uses_history,
+    visible_slice, write_table,
+)
+from render import COLORS, REPORT_FORMATS, figure_jobs, render_figures, style_axes
+
+# Live tail (follow mode) settings
+FOLLOW_POLL_MS = 500
+FOLLOW_DEFAULT_WINDOW_S = 30
+
+# Multi-channel view: points kept per horizontal pixel and per channel (min + max)
+MULTI_POINTS_PER_PIXEL = 2
+
+# Event detection: minimum flat-line duration (s)
+EVENT_FLAT_MIN_S = 0.5
+
+# Interactive pan/zoom: redraws coalesced to one per frame (ms), full-quality
+# redraw once the interaction has settled (ms), samples scanned per curve while
+# interacting, zoom factor per wheel notch / key press, pan step (view fraction)
+REDRAW_FRAME_MS = 16
+REDRAW_SETTLE_MS = 200
+PREVIEW_MAX_POINTS = 200_000
+ZOOM_STEP = 1.25
+PAN_STEP = 0.1
+
+# Filter preview: when the view shows less than this fraction of the rows, only
+# the visible rows are filtered at once, the whole channel in the background
+FILTER_PREVIEW_MAX_FRACTION = 0.5
+FILTER_POLL_MS = 50
+
+# Two-phase load: polling period of the background full parse (ms)
+LOAD_POLL_MS = 100
+
+# File dialogs
+DATA_FILETYPES = [('CSV', '*.csv'), ('CSV compressé', '*.csv.gz *.csv.zip *.csv.xz *.csv.bz2 *.csv.zst'),
+                  ('Parquet', '*.parquet'), ('Feather / Arrow', '*.feather *.arrow'),
+                  ('NumPy', '*.npz'), ('All files', '*.*')]
+
+# Comparison run colors
+COMPARE_COLORS = ['#D32F2F', '#388E3C', '#F57C00', '#7B1FA2', '#00838F',
+                  '#C2185B', '#5D4037', '#455A64', '#AFB42B', '#512DA8']
+
+
+def _run_in_background(fn, *args, **kwargs):
+    """Future of fn(*args, **kwargs) computed in its own daemon thread.
+
+    Unlike executor workers, the thread is not joined at exit: closing the
+    window does not wait for a long parse or filter to finish.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
 
 class ModernButton(tk.Canvas):
     """Custom modern button with hover effects"""
@@ -57,7 +115,16 @@ class ModernButton(tk.Canvas):
         self.create_rectangle(0, radius, self.width, self.height-radius, fill=color, outline=color)
         # Text
         self.create_text(self.width//2, self.height//2, text=self.text, fill=self.fg, font=('Segoe UI', 10, 'bold'))
-    
+
+    def set_text(self, text, bg=None, hover_bg=None):
+        """Change the label (and optionally colors) of the button"""
+        self.text = text
+        if bg is not None:
+            self.bg = bg
+        if hover_bg is not None:
+            self.hover_bg = hover_bg
+        self._draw_button(self.bg)
+
     def _on_enter(self, event):
         self._draw_button(self.hover_bg)
     
@@ -75,7 +142,8 @@ class CsvPlotApp:
         self.root.title('📊 CSV Plotter Pro')
         self.root.configure(bg=COLORS['bg_dark'])
         self.root.geometry('1200x800')
-        self.df = None
+        # Displayed file (csv_core.Dataset): rows, sampling frequency, derived channels and tables
+        self.dataset = None
 
         # Configure ttk styles
         self._setup_styles()
@@ -96,9 +164,27 @@ class CsvPlotApp:
         title_label.pack(side=tk.LEFT, padx=20, pady=10)
 
         # Controls panel (left side) - with scrollable content
-        left_panel = tk.Frame(main_container, bg=COLORS['bg_medium'], width=280)
-        left_panel.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
-        left_panel.pack_propagate(False)
+        left_outer = tk.Frame(main_container, bg=COLORS['bg_medium'], width=280)
+        left_outer.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
+        left_outer.pack_propagate(False)
+        left_scroll = ttk.Scrollbar(left_outer, orient=tk.VERTICAL)
+        left_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        left_canvas = tk.Canvas(left_outer, bg=COLORS['bg_medium'], highlightthickness=0,
+                                yscrollcommand=left_scroll.set)
+        left_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        left_scroll.config(command=left_canvas.yview)
+        left_panel = tk.Frame(left_canvas, bg=COLORS['bg_medium'])
+        left_window = left_canvas.create_window((0, 0), window=left_panel, anchor='nw')
+        left_panel.bind('<Configure>', lambda e: left_canvas.configure(scrollregion=left_canvas.bbox('all')))
+        left_canvas.bind('<Configure>', lambda e: left_canvas.itemconfigure(left_window, width=e.width))
+
+        # Scroll with the mouse wheel while the pointer is over the panel
+        def _on_panel_wheel(event):
+            if str(event.widget).startswith(str(left_outer)):
+                up = getattr(event, 'delta', 0) > 0 or getattr(event, 'num', None) == 4
+                left_canvas.yview_scroll(-1 if up else 1, 'units')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            root.bind_all(sequence, _on_panel_wheel, add='+')
 
         # File section
         self._create_section(left_panel, '📁 Fichier', 0)
@@ -108,13 +194,33 @@ class CsvPlotApp:
         
         self.load_btn = ModernButton(file_frame, '📂 Charger CSV', self.load_csv, width=250, height=28)
         self.load_btn.pack(pady=3)
+        self.segments_btn = ModernButton(file_frame, '🧩 Charger des segments...', self.load_segments,
+                                         width=250, height=28)
+        self.segments_btn.pack(pady=3)
+
+        # Resume the previous session (only shown if one was saved)
+        self.restore_btn = ModernButton(file_frame, '🕘 Reprendre la session', self.restore_session,
+                                        width=250, height=28, bg=COLORS['accent'], hover_bg=COLORS['accent_hover'])
+        if os.path.exists(SESSION_FILE):
+            self.restore_btn.pack(pady=3)
         
         self.file_label = tk.Label(file_frame, text='Aucun fichier chargé', 
                                    font=('Segoe UI', 8), fg=COLORS['text_muted'], 
                                    bg=COLORS['bg_medium'], wraplength=240)
         self.file_label.pack(pady=2)
-        
-        # Compare button (initially hidden)
+
+        # Follow (live tail) button and scrolling window (initially hidden)
+        self.follow_btn = ModernButton(file_frame, '📡 Suivre le fichier', self.toggle_follow,
+                                       width=250, height=28, bg=COLORS['success'], hover_bg='#388E3C')
+        self.follow_frame = tk.Frame(file_frame, bg=COLORS['bg_medium'])
+        tk.Label(self.follow_frame, text='Fenêtre glissante (s, 0 = tout)', font=('Segoe UI', 8),
+                fg=COLORS['text_muted'], bg=COLORS['bg_medium']).pack(side=tk.LEFT)
+        self.follow_window_var = tk.StringVar(value=str(FOLLOW_DEFAULT_WINDOW_S))
+        ttk.Entry(self.follow_frame, textvariable=self.follow_window_var,
+                  width=6).pack(side=tk.RIGHT)
+        # Don't pack yet - will be shown after first file is loaded
+
+        # Compare button (initially hidden) - can be used several times to add runs
         self.compare_btn = ModernButton(file_frame, '🔄 Comparer avec...', self.load_compare_csv, 
                                         width=250, height=28, bg=COLORS['warning'], hover_bg='#F57C00')
         # Don't pack yet - will be shown after first file is loaded
@@ -124,6 +230,20 @@ class CsvPlotApp:
                                       bg=COLORS['bg_medium'], wraplength=240)
         # Don't pack yet
         
+        # Comparison display options (initially hidden)
+        self.compare_options_frame = tk.Frame(file_frame, bg=COLORS['bg_medium'])
+        self.compare_envelope_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.compare_options_frame, text='Enveloppe min/max',
+                        variable=self.compare_envelope_var,
+                        command=self._on_axis_change).pack(anchor='w')
+        self.compare_diff_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.compare_options_frame, text='Différences vs principal',
+                        variable=self.compare_diff_var,
+                        command=self._on_axis_change).pack(anchor='w')
+        ModernButton(self.compare_options_frame, '⏱ Aligner (corrélation)', self.auto_align_compare,
+                     width=250, height=28, bg=COLORS['accent'], hover_bg=COLORS['accent_hover']).pack(pady=3)
+        # Don't pack yet
+
         # Cancel compare button (initially hidden)
         self.cancel_compare_btn = ModernButton(file_frame, '❌ Annuler comparaison', self.cancel_compare, 
                                                width=250, height=28, bg='#f44336', hover_bg='#d32f2f')
@@ -151,6 +271,25 @@ class CsvPlotApp:
                                     values=[], state='readonly', width=35)
         self.y_combo.pack(fill=tk.X, pady=(1, 5))
 
+        # Multi-channel view: several Y columns in stacked axes sharing X
+        tk.Label(axes_frame, text='Voies multiples (Ctrl+clic)', font=('Segoe UI', 9, 'bold'),
+                fg=COLORS['text'], bg=COLORS['bg_medium']).pack(anchor='w')
+        self.multi_listbox = tk.Listbox(axes_frame, selectmode=tk.EXTENDED, height=4,
+                                        exportselection=False, font=('Segoe UI', 9),
+                                        bg=COLORS['bg_light'], fg=COLORS['text'],
+                                        selectbackground=COLORS['accent'],
+                                        highlightthickness=0, relief=tk.FLAT)
+        self.multi_listbox.pack(fill=tk.X, pady=(1, 3))
+        self.multi_btn = ModernButton(axes_frame, '📚 Vue multi-voies', self.plot_multi_channel,
+                                      width=250, height=28, bg=COLORS['accent'],
+                                      hover_bg=COLORS['accent_hover'])
+        self.multi_btn.pack(pady=3)
+
+        self.derived_btn = ModernButton(axes_frame, '🧮 Voies dérivées', self.edit_derived_channels,
+                                        width=250, height=28, bg=COLORS['accent'],
+                                        hover_bg=COLORS['accent_hover'])
+        self.derived_btn.pack(pady=3)
+
         # Filter section
         self.filter_section = self._create_section(left_panel, '🎚️ Filtre Butterworth', 2)
         
@@ -179,12 +318,44 @@ class CsvPlotApp:
         self.filter_entry = ttk.Entry(filter_frame, textvariable=self.filter_freq_var, 
                                       width=38, font=('Segoe UI', 10))
         self.filter_entry.pack(fill=tk.X, pady=(0, 5))
+        self.filter_entry.bind('<Return>', lambda e: self.apply_filter())
         
         self.filter_btn = ModernButton(filter_frame, '🔊 Appliquer filtre', 
                                        self.apply_filter, width=250, height=28,
                                        bg=COLORS['success'], hover_bg='#388E3C')
         self.filter_btn.pack(pady=3)
 
+        # Rolling-window operators (overlaid like the filtered curve)
+        tk.Label(filter_frame, text='Opérateur glissant', font=('Segoe UI', 9),
+                fg=COLORS['text'], bg=COLORS['bg_medium']).pack(anchor='w', pady=(6, 1))
+        rolling_row = tk.Frame(filter_frame, bg=COLORS['bg_medium'])
+        rolling_row.pack(fill=tk.X, pady=(0, 5))
+        self.rolling_op_var = tk.StringVar(value='RMS')
+        ttk.Combobox(rolling_row, textvariable=self.rolling_op_var, values=list(ROLLING_OPERATORS),
+                     state='readonly', width=10).pack(side=tk.LEFT)
+        self.rolling_unit_var = tk.StringVar(value='s')
+        ttk.Combobox(rolling_row, textvariable=self.rolling_unit_var, values=['s', 'éch.'],
+                     state='readonly', width=4).pack(side=tk.RIGHT)
+        self.rolling_window_var = tk.StringVar(value='1.0')
+        ttk.Entry(rolling_row, textvariable=self.rolling_window_var, width=8).pack(side=tk.RIGHT, padx=3)
+
+        self.rolling_btn = ModernButton(filter_frame, '〰️ Appliquer opérateur',
+                                        self.apply_rolling, width=250, height=28,
+                                        bg=COLORS['success'], hover_bg='#388E3C')
+        self.rolling_btn.pack(pady=3)
+
+        # Anti-aliased resampling of the loaded data (also offered at export)
+        tk.Label(filter_frame, text='Rééchantillonnage (Hz cible)', font=('Segoe UI', 9),
+                fg=COLORS['text'], bg=COLORS['bg_medium']).pack(anchor='w', pady=(6, 1))
+        self.resample_var = tk.StringVar(value='')
+        ttk.Entry(filter_frame, textvariable=self.resample_var,
+                  width=38, font=('Segoe UI', 10)).pack(fill=tk.X, pady=(0, 5))
+
+        self.resample_btn = ModernButton(filter_frame, '⬇️ Rééchantillonner',
+                                         self.resample_data, width=250, height=28,
+                                         bg=COLORS['success'], hover_bg='#388E3C')
+        self.resample_btn.pack(pady=3)
+
         # Export section
         self.export_section = self._create_section(left_panel, '💾 Export', 3)
         
@@ -196,12 +367,66 @@ class CsvPlotApp:
         self.export_check = ttk.Checkbutton(export_frame, text='Exporter données filtrées',
                                             variable=self.export_filtered_var)
         self.export_check.pack(anchor='w', pady=(0, 5))
+
+        self.export_rolling_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(export_frame, text='Exporter opérateur glissant',
+                        variable=self.export_rolling_var).pack(anchor='w', pady=(0, 5))
+
+        self.export_resampled_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(export_frame, text='Exporter rééchantillonné (Hz cible)',
+                        variable=self.export_resampled_var).pack(anchor='w', pady=(0, 5))
         
         self.export_btn = ModernButton(export_frame, '💾 Exporter CSV', 
                                        self.export_csv, width=250, height=28,
                                        bg=COLORS['accent'], hover_bg=COLORS['accent_hover'])
         self.export_btn.pack(pady=3)
 
+        # Analysis section
+        self.analysis_section = self._create_section(left_panel, '📐 Analyse', 4)
+
+        analysis_frame = tk.Frame(left_panel, bg=COLORS['bg_medium'])
+        analysis_frame.pack(fill=tk.X, padx=15, pady=(0, 8))
+
+        threshold_row = tk.Frame(analysis_frame, bg=COLORS['bg_medium'])
+        threshold_row.pack(fill=tk.X, pady=(0, 3))
+        tk.Label(threshold_row, text='Seuil (temps au-dessus)', font=('Segoe UI', 9),
+                fg=COLORS['text'], bg=COLORS['bg_medium']).pack(side=tk.LEFT)
+        self.threshold_var = tk.StringVar(value='0')
+        ttk.Entry(threshold_row, textvariable=self.threshold_var, width=10).pack(side=tk.RIGHT)
+
+        self.stats_btn = ModernButton(analysis_frame, '📐 Statistiques de la plage',
+                                      self.show_stats, width=250, height=28,
+                                      bg=COLORS['accent'], hover_bg=COLORS['accent_hover'])
+        self.stats_btn.pack(pady=3)
+
+        self.events_btn = ModernButton(analysis_frame, '🔎 Détecter événements',
+                                       self.detect_events, width=250, height=28,
+                                       bg=COLORS['accent'], hover_bg=COLORS['accent_hover'])
+        self.events_btn.pack(pady=3)
+        tk.Label(analysis_frame, text='Touches N / P sur le graphique : événement suivant / précédent',
+                 font=('Segoe UI', 8), fg=COLORS['text_muted'], bg=COLORS['bg_medium'],
+                 wraplength=240, justify=tk.LEFT).pack(anchor='w')
+
+        # Image report section, kept in compare mode: one figure per channel
+        # (selected in the list, else all) of the main file and of every compared run
+        self._create_section(left_panel, '🖼️ Rapport', 5)
+
+        report_frame = tk.Frame(left_panel, bg=COLORS['bg_medium'])
+        report_frame.pack(fill=tk.X, padx=15, pady=(0, 8))
+
+        report_row = tk.Frame(report_frame, bg=COLORS['bg_medium'])
+        report_row.pack(fill=tk.X, pady=(0, 3))
+        tk.Label(report_row, text='Format des images', font=('Segoe UI', 9),
+                fg=COLORS['text'], bg=COLORS['bg_medium']).pack(side=tk.LEFT)
+        self.report_format_var = tk.StringVar(value=REPORT_FORMATS[0])
+        ttk.Combobox(report_row, textvariable=self.report_format_var, values=list(REPORT_FORMATS),
+                     state='readonly', width=6).pack(side=tk.RIGHT)
+
+        self.report_btn = ModernButton(report_frame, '🖼️ Rapport images',
+                                       self.export_report, width=250, height=28,
+                                       bg=COLORS['accent'], hover_bg=COLORS['accent_hover'])
+        self.report_btn.pack(pady=3)
+
         # Graph area (right side)
         graph_container = tk.Frame(main_container, bg=COLORS['bg_medium'])
         graph_container.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
@@ -238,36 +463,100 @@ class CsvPlotApp:
         self.x_data = None
         self.y_data = None
         self.y_filtered = None
+        # Whole-channel filter computed in the background while a preview is shown
+        self._filter_job = None
+        self._filter_line = None
         self.x_is_index = False
         self.selected_indices = []
         self.y_choice = None
-        self.sampling_frequency = 1000
         self.loaded_file_path = None
         self._suspend_auto_plot = False
-        
+        self.derived_defs = dict(BUILTIN_DERIVED)
+        self._column_signature = None
+        self._derived_window = None
+        self._main_line = None
+
+        # Follow (live tail) mode
+        self._follow_active = False
+        self._follow_after_id = None
+        self._follow_buffer = None
+        self._follow_offset = 0
+        self._follow_dirty = False
+
+        # Range statistics window (tables cached per column by the Dataset)
+        self._stats_window = None
+        self._stats_tree = None
+
+        # Detected events and current position while navigating
+        self._events = None
+        self._event_pos = None
+        self._event_markers = None
+
+        # Paths of the concatenated segments (None for a single file)
+        self._segment_paths = None
+        # Full parse running in the background while a preview is displayed; a
+        # superseded parse keeps running in its thread but its result is dropped
+        self._load_job = None
+        # Target rate asked for the displayed data (None: rows as read)
+        self._resample_target = None
+
         # Comparison mode
         self.compare_mode = False
-        self.df_compare = None
-        self.compare_file_path = None
-        self.x_data_compare = None
-        self.y_data_compare = None
+        # One {'path', 'store', 'x_offsets'} entry per comparison run (x_offsets: X column -> shift)
+        self.compare_runs = []
+
+        # Curves of the single plot re-decimated on zoom/pan: (line, y) sharing x_data
+        self._decimated_lines = []
+        self._main_x_sorted = False
+        # Comparison curves rebuilt for the visible X range (see _update_compare_view)
+        self._compare_view = None
 
         # Mouse/zoom state
         self._zoom_rect = None
         self._press_event = None
         self._is_dragging = False
+        self._pan_start = None
         self._base_xlim = None
         self._base_ylim = None
 
+        # Redraw scheduler: one draw per frame while interacting (preview
+        # decimation), full-quality redraw once the interaction has settled
+        self._redraw_after_id = None
+        self._settle_after_id = None
+        self._interacting = False
+
+        # Multi-channel view state (None when showing a single plot)
+        self._multi_axes = None
+        self._multi_lines = []
+        self._multi_y = []
+        self._multi_base_ylims = []
+        self._multi_x_sorted = False
+
         # Connect mouse events
         self.fig.canvas.mpl_connect('button_press_event', self._on_mouse_press)
         self.fig.canvas.mpl_connect('motion_notify_event', self._on_mouse_move)
         self.fig.canvas.mpl_connect('button_release_event', self._on_mouse_release)
+        self.fig.canvas.mpl_connect('key_press_event', self._on_key_press)
+        self.fig.canvas.mpl_connect('scroll_event', self._on_scroll)
 
         # Bind combobox events
         self.x_combo.bind('<<ComboboxSelected>>', lambda e: self._on_axis_change())
         self.y_combo.bind('<<ComboboxSelected>>', lambda e: self._on_axis_change())
 
+        # Save the session when the window is closed
+        self.root.protocol('WM_DELETE_WINDOW', self._on_close)
+        # Drop cache writes interrupted by a previous close and cached files over the limits
+        threading.Thread(target=prune_cache, daemon=True).start()
+
+    @property
+    def df(self):
+        """Rows of the displayed file (None before the first load)"""
+        return self.dataset.df if self.dataset is not None else None
+
+    @property
+    def sampling_frequency(self):
+        return self.dataset.sampling_frequency if self.dataset is not None else 1000
+
     def _setup_styles(self):
         """Configure ttk styles for modern look"""
         style = ttk.Style()
@@ -311,16 +600,9 @@ class CsvPlotApp:
         
         return frame
 
-    def _style_axes(self):
-        """Apply light theme to matplotlib axes"""
-        self.ax.set_facecolor('#ffffff')
-        self.ax.tick_params(colors=COLORS['text'], which='both')
-        self.ax.xaxis.label.set_color(COLORS['text'])
-        self.ax.yaxis.label.set_color(COLORS['text'])
-        self.ax.title.set_color(COLORS['text'])
-        for spine in self.ax.spines.values():
-            spine.set_color(COLORS['border'])
-        self.ax.grid(True, color=COLORS['border'], alpha=0.5, linestyle='--')
+    def _style_axes(self, ax=None):
+        """Apply light theme to matplotlib axes (main axes by default)"""
+        style_axes(ax if ax is not None else self.ax)
 
     def _on_axis_change(self):
         """Handle axis selection change"""
@@ -333,161 +615,348 @@ class CsvPlotApp:
         if values and combo.get() not in values:
             combo.set(values[0] if values else '')
 
-    def load_csv(self):
-        path = filedialog.askopenfilename(filetypes=[('CSV', '*.csv'), ('All files', '*.*')])
+    def _update_column_lists(self):
+        """Fill the X/Y selectors with the loaded columns and the derivable channels"""
+        cols = list(self.df.columns)
+        cols += [c for c in derivable_channels(cols, self.derived_defs) if c not in cols]
+        self._update_combobox(self.x_combo, ['Index'] + cols)
+
+        # Y selectors: numeric columns only (derived channels are numeric)
+        num_cols = [c for c in cols if c not in self.df.columns or pd.api.types.is_numeric_dtype(self.df[c])]
+        if not num_cols:
+            # if no numeric columns, allow all columns
+            num_cols = cols
+        self._update_combobox(self.y_combo, num_cols)
+        self.multi_listbox.delete(0, tk.END)
+        for col in num_cols:
+            self.multi_listbox.insert(tk.END, col)
+        return num_cols
+
+    def _ensure_columns(self, *cols):
+        """Compute the derived channels among cols that are not in memory yet"""
+        for col in cols:
+            if col == 'Index' or col in self.df.columns:
+                continue
+            self.dataset.column(col)
+            # Keep appending the new channel in follow mode
+            if self._follow_buffer is not None:
+                for name in self.df.columns:
+                    if name not in self._follow_buffer.columns:
+                        self._follow_buffer.add_column(name, self.df[name].to_numpy())
+
+    def _forget_column(self, name):
+        """Drop a computed derived channel from memory"""
+        if self.dataset is not None:
+            self.dataset.forget(name)
+        if self._follow_buffer is not None:
+            self._follow_buffer.drop_column(name)
+
+    def edit_derived_channels(self):
+        """Dialog to define derived channels as expressions over the columns"""
+        if self._derived_window is not None and self._derived_window.winfo_exists():
+            self._derived_window.lift()
+            return
+        win = tk.Toplevel(self.root)
+        win.title('🧮 Voies dérivées')
+        win.configure(bg=COLORS['bg_medium'])
+        win.geometry('620x420')
+        self._derived_window = win
+
+        listbox = tk.Listbox(win, font=('Segoe UI', 9), bg=COLORS['bg_light'], fg=COLORS['text'],
+                             selectbackground=COLORS['accent'], highlightthickness=0, relief=tk.FLAT)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+
+        form = tk.Frame(win, bg=COLORS['bg_medium'])
+        form.pack(fill=tk.X, padx=10)
+        tk.Label(form, text='Nom', font=('Segoe UI', 9), fg=COLORS['text'],
+                bg=COLORS['bg_medium']).grid(row=0, column=0, sticky='w')
+        name_var = tk.StringVar()
+        ttk.Entry(form, textvariable=name_var).grid(row=0, column=1, sticky='ew', pady=2)
+        tk.Label(form, text='Expression', font=('Segoe UI', 9), fg=COLORS['text'],
+                bg=COLORS['bg_medium']).grid(row=1, column=0, sticky='w')
+        expr_var = tk.StringVar()
+        ttk.Entry(form, textvariable=expr_var).grid(row=1, column=1, sticky='ew', pady=2)
+        form.columnconfigure(1, weight=1)
+        tk.Label(win, text='Colonnes entre `backquotes`, ex. sqrt(`Fx (N)`**2 + `Fy (N)`**2)\n'
+                           'Fonctions : ' + ', '.join(EXPRESSION_FUNCTIONS),
+                 font=('Segoe UI', 8), fg=COLORS['text_muted'], bg=COLORS['bg_medium'],
+                 justify=tk.LEFT, wraplength=590).pack(anchor='w', padx=10, pady=(2, 5))
+
+        def refresh():
+            listbox.delete(0, tk.END)
+            for name, expression in self.derived_defs.items():
+                listbox.insert(tk.END, f'{name} = {expression}')
+
+        def on_select(event):
+            sel = listbox.curselection()
+            if sel:
+                name = list(self.derived_defs)[sel[0]]
+                name_var.set(name)
+                expr_var.set(self.derived_defs[name])
+
+        def save_and_refresh():
+            if self._column_signature is not None:
+                try:
+                    save_derived_definitions(self._column_signature, self.derived_defs)
+                except OSError as e:
+                    messagebox.showwarning('Avertissement', f"Définitions non sauvegardées :\n{e}", parent=win)
+            refresh()
+            if self.df is not None:
+                self._suspend_auto_plot = True
+                self._update_column_lists()
+                self._suspend_auto_plot = False
+
+        def add():
+            name = name_var.get().strip()
+            expression = expr_var.get().strip()
+            if not name or not expression:
+                return
+            try:
+                compiled = DerivedExpression(expression)
+            except ValueError as e:
+                messagebox.showerror('Erreur', f"Expression invalide :\n{e}", parent=win)
+                return
+            if name in compiled.columns:
+                messagebox.showerror('Erreur', 'Une voie ne peut pas dépendre d\'elle-même.', parent=win)
+                return
+            if self.df is not None:
+                known = set(self.df.columns) | set(derivable_channels(self.df.columns, self.derived_defs))
+                missing = [c for c in compiled.columns if c not in known]
+                if missing:
+                    messagebox.showerror('Erreur', 'Colonnes inconnues : ' + ', '.join(missing), parent=win)
+                    return
+                # A redefined channel is recomputed on next use
+                if name in self.derived_defs:
+                    self._forget_column(name)
+            self.derived_defs[name] = expression
+            save_and_refresh()
+
+        def remove():
+            sel = listbox.curselection()
+            if not sel:
+                return
+            name = list(self.derived_defs)[sel[0]]
+            if name in BUILTIN_DERIVED:
+                messagebox.showinfo('Voie intégrée', 'Cette voie est intégrée et ne peut pas être supprimée.', parent=win)
+                return
+            del self.derived_defs[name]
+            self._forget_column(name)
+            save_and_refresh()
+
+        listbox.bind('<<ListboxSelect>>', on_select)
+        buttons = tk.Frame(win, bg=COLORS['bg_medium'])
+        buttons.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ModernButton(buttons, '➕ Ajouter / Remplacer', add, width=200, height=28,
+                     bg=COLORS['success'], hover_bg='#388E3C').pack(side=tk.LEFT)
+        ModernButton(buttons, '🗑 Supprimer', remove, width=150, height=28,
+                     bg='#f44336', hover_bg='#d32f2f').pack(side=tk.RIGHT)
+        refresh()
+
+    def load_csv(self, path=None, axes=None, preview=True):
+        """Load a file (asked if not given); axes = (X, Y) to plot instead of the defaults.
+
+        With preview, a large CSV is first shown from lines sampled over the
+        file while it is fully read in the background.
+        """
+        if path is None:
+            path = filedialog.askopenfilename(filetypes=DATA_FILETYPES)
         if not path:
             return
 
-        # Try reading the CSV with several fallbacks to handle different delimiters
-        df = None
-        last_err = None
-        
-        # First, try to sniff delimiter with csv.Sniffer
-        sep = None
-        decimal_char = '.'
-        try:
-            with open(path, 'r', newline='', encoding='utf-8') as f:
-                sample = f.read(4096)
-                sniffer = csv.Sniffer()
-                dialect = sniffer.sniff(sample)
-                sep = dialect.delimiter
-                # detect decimal comma in sample (e.g. '0,1' but not when comma is separator)
-                if sep == ';' or (sep != ',' and bool(re.search(r"\d,\d", sample))):
-                    decimal_char = ','
-        except Exception:
-            # If sniffing fails, check if semicolon is present (common French CSV format)
+        # A new file replaces the followed one (and one still loading)
+        if self._follow_active:
+            self.stop_follow()
+        self._load_job = None
+
+        if preview:
             try:
-                with open(path, 'r', newline='', encoding='utf-8') as f:
-                    sample = f.read(4096)
-                    if ';' in sample:
-                        sep = ';'
-                        if bool(re.search(r"\d,\d", sample)):
-                            decimal_char = ','
+                dataset = Dataset.load_preview(path)
             except Exception:
-                pass
+                # Unusual layout: the full load reports the errors
+                dataset = None
+            if dataset is not None and not dataset.df.empty:
+                self._segment_paths = None
+                self._use_dataframe(dataset, axes)
+                self.file_label.config(text=f'⏳ {os.path.basename(path)}')
+                self.index_label.config(text=f'⏳ Aperçu : {len(dataset.df)} lignes sur ~{dataset.estimated_rows} '
+                                             f'• lecture complète en cours')
+                self._load_job = {'path': path, 'future': _run_in_background(Dataset.load, path, use_cache=True)}
+                self._poll_background_load(self._load_job)
+                return
 
-        # Try reading with detected separator
         try:
-            if sep:
-                df = pd.read_csv(path, sep=sep, decimal=decimal_char)
-            else:
-                df = pd.read_csv(path)
+            dataset = Dataset.load(path, use_cache=True)
         except Exception as e:
-            last_err = e
-
-        # If df has only one column, it might have been parsed incorrectly - retry with semicolon
-        if df is not None and len(df.columns) == 1 and ';' in df.columns[0]:
-            try:
-                df = pd.read_csv(path, sep=';', decimal=',')
-            except Exception as e:
-                last_err = e
-                df = None
-
-        # Final fallback: use python engine with auto-detection
-        if df is None:
-            try:
-                df = pd.read_csv(path, sep=None, engine='python', decimal=decimal_char)
-            except Exception as e2:
-                last_err = e2
-                # Final attempt: skip bad lines
-                try:
-                    df = pd.read_csv(path, sep=None, engine='python', on_bad_lines='skip')
-                    messagebox.showwarning('Avertissement', 'Certaines lignes malformées ont été ignorées lors de la lecture.')
-                except Exception as e3:
-                    last_err = e3
-
-        if df is None:
-            messagebox.showerror('Erreur', f"Impossible de lire le fichier:\n{last_err}")
+            messagebox.showerror('Erreur', f"Impossible de lire le fichier:\n{e}")
             return
+        if dataset.bad_lines_skipped:
+            messagebox.showwarning('Avertissement', 'Certaines lignes malformées ont été ignorées lors de la lecture.')
 
-        if df.empty:
+        if dataset.df.empty:
             messagebox.showwarning('Vide', 'Le fichier CSV est vide.')
             return
 
-        # Convert datetime columns to seconds (relative to first value)
-        for col in df.columns:
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                try:
-                    # Check if it looks like a datetime with French format (dd/mm/yyyy HH:MM:SS,microseconds)
-                    first_val = str(df[col].iloc[0])
-                    if '/' in first_val and ':' in first_val:
-                        # Custom parser for format: "30/01/2026 13:57:56,630000"
-                        def parse_french_datetime(val):
-                            try:
-                                val_str = str(val)
-                                # Replace comma with dot for microseconds
-                                val_str = val_str.replace(',', '.')
-                                # Parse with explicit format
-                                return pd.to_datetime(val_str, format='%d/%m/%Y %H:%M:%S.%f')
-                            except:
-                                return pd.NaT
-                        
-                        datetime_col = df[col].apply(parse_french_datetime)
-                        if datetime_col.notna().all():
-                            # Convert to seconds from start
-                            time_delta = (datetime_col - datetime_col.iloc[0]).dt.total_seconds()
-                            df[col] = time_delta
-                except Exception:
-                    pass  # Keep original if conversion fails
-        
-        # Convert string columns with French decimal format (comma) to numeric
-        for col in df.columns:
-            if df[col].dtype == object:
-                try:
-                    # Try to convert string with comma decimal to float
-                    df[col] = df[col].astype(str).str.replace(',', '.').astype(float)
-                except Exception:
-                    pass  # Keep as string if conversion fails
+        self._segment_paths = None
+        self._use_dataframe(dataset, axes)
 
-        # Auto-create "Effort Z total (N)" if Z1, Z2, Z3 columns exist
-        z_cols = ['Effort Z1 (N)', 'Effort Z2 (N)', 'Effort Z3 (N)']
-        if all(col in df.columns for col in z_cols):
-            df['Effort Z total (N)'] = df['Effort Z1 (N)'] + df['Effort Z2 (N)'] + df['Effort Z3 (N)']
+    def _poll_background_load(self, job):
+        """Replace the preview with the whole file once read, keeping the axes and the zoom"""
+        if self._load_job is not job:
+            # Another file was loaded meanwhile
+            return
+        if not job['future'].done():
+            self.root.after(LOAD_POLL_MS, lambda: self._poll_background_load(job))
+            return
+        self._load_job = None
+        try:
+            dataset = job['future'].result()
+        except Exception as e:
+            # The sampled rows must not be taken for the file (export, statistics, follow...)
+            self._discard_preview()
+            messagebox.showerror('Erreur', f"Impossible de lire le fichier:\n{e}")
+            return
+        if dataset.bad_lines_skipped:
+            messagebox.showwarning('Avertissement', 'Certaines lignes malformées ont été ignorées lors de la lecture.')
+
+        axes = (self.x_var.get(), self.y_var.get())
+        view = None
+        if self._base_xlim is not None and tuple(self.ax.get_xlim()) != tuple(self._base_xlim):
+            view = (self.ax.get_xlim(), self.ax.get_ylim())
+        channels = [ax.get_ylabel() for ax in self._multi_axes] if self._multi_axes else None
+        entries = [(var, var.get()) for var in (self.filter_freq_var, self.resample_var)]
+        self._use_dataframe(dataset, axes)
+        for var, value in entries:
+            var.set(value)
+        if channels:
+            for i, col in enumerate(self.multi_listbox.get(0, tk.END)):
+                if col in channels:
+                    self.multi_listbox.selection_set(i)
+            self.plot_multi_channel()
+        if view is not None:
+            self.ax.set_xlim(view[0])
+            if not channels:
+                self.ax.set_ylim(view[1])
+            self._request_redraw()
+
+    def _discard_preview(self):
+        """Go back to the empty window when the file shown as a preview could not be read"""
+        self._cancel_filter_job()
+        self.dataset = None
+        self.loaded_file_path = None
+        self.x_data = self.y_data = self.y_filtered = None
+        self.y_choice = None
+        self.selected_indices = []
+        self._filter_line = None
+        self._main_line = None
+        self._decimated_lines = []
+        self._compare_view = None
+        self._events = None
+        self._event_pos = None
+        self._event_markers = None
+        self._base_xlim = self._base_ylim = None
+        self._leave_multi_view()
+        self.ax.clear()
+        self._style_axes()
+        self._request_redraw()
+
+        self._update_combobox(self.x_combo, [])
+        self._update_combobox(self.y_combo, [])
+        self.x_var.set('')
+        self.y_var.set('')
+        self.multi_listbox.delete(0, tk.END)
+        self.sampling_freq_label.config(text='— Hz')
+        self.file_label.config(text='Aucun fichier chargé')
+        self.index_label.config(text='💡 Chargez un fichier CSV pour commencer')
+        self.minmax_label.config(text='')
+        self.follow_btn.pack_forget()
+        self.follow_frame.pack_forget()
+        self.compare_btn.pack_forget()
 
-        self.df = df
-        self.loaded_file_path = path  # Store the path of loaded file
-        cols = list(df.columns)
+    def _loading(self):
+        """Warn and return True while the full file is still being read behind its preview"""
+        if self._load_job is None:
+            return False
+        messagebox.showwarning('Chargement en cours', 'La lecture complète du fichier est en cours, '
+                                                      'réessayez dans un instant.')
+        return True
+
+    def load_segments(self, paths=None, axes=None):
+        """Load split acquisition segments (parsed in parallel) as one continuous file"""
+        if paths is None:
+            paths = filedialog.askopenfilenames(filetypes=DATA_FILETYPES)
+        if not paths:
+            return
+        paths = sorted(paths, key=natural_key)
+        if len(paths) == 1:
+            self.load_csv(paths[0], axes)
+            return
+
+        if self._follow_active:
+            self.stop_follow()
+        self._load_job = None
 
-        # Calculate sampling frequency from first column (time column)
+        start = time.perf_counter()
         try:
-            if len(df) > 1:
-                first_col = df.iloc[:, 0]  # First column
-                time_diff = np.diff(first_col)
-                mean_time_diff = np.mean(time_diff)
-                if mean_time_diff > 0:
-                    self.sampling_frequency = 1.0 / mean_time_diff
-                else:
-                    self.sampling_frequency = 1000  # Default if can't calculate
-        except Exception:
-            self.sampling_frequency = 1000  # Default sampling frequency
+            dataset = Dataset.load_segments(paths)
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible de lire les segments :\n\n{e}")
+            return
+        df = dataset.df
+        if df.empty:
+            messagebox.showwarning('Vide', 'Les fichiers sont vides.')
+            return
+        if dataset.dropped_columns:
+            messagebox.showwarning('Segments', 'Colonnes absentes de certains segments, ignorées :\n'
+                                   + ', '.join(dataset.dropped_columns))
+
+        # Rows can't be appended to concatenated segments (dataset has no csv_format)
+        self._segment_paths = list(paths)
+        self._use_dataframe(dataset, axes)
+        self.file_label.config(text=f'✅ {os.path.basename(paths[0])} … {os.path.basename(paths[-1])} '
+                                    f'({len(paths)} segments)')
+        self.index_label.config(text=f'🧩 {len(paths)} segments • {len(df)} points en '
+                                     f'{time.perf_counter() - start:.2f} s')
+
+    def _use_dataframe(self, dataset, axes=None):
+        """Display a loaded Dataset: derived channels, sampling frequency, selectors and plot"""
+        # Derived channels saved for this column layout (computed on first use)
+        self._column_signature = column_signature(dataset.raw_columns)
+        dataset.derived_defs = load_derived_definitions(self._column_signature)
+        self.derived_defs = dataset.derived_defs
+
+        self.dataset = dataset
+        df = dataset.df
+        self.loaded_file_path = dataset.path  # Store the path of loaded file
+        cols = list(df.columns)
 
         # Update sampling frequency display and filter frequency field
         self.sampling_freq_label.config(text=f'{self.sampling_frequency:.0f} Hz')
         self.filter_freq_var.set(f'{self.sampling_frequency / 4:.2f}')  # Suggest Nyquist/4 as default cutoff
+        self.resample_var.set(f'{self.sampling_frequency / 10:g}')
+        self._resample_target = None
 
         # Update X/Y comboboxes. suspend auto-plot while populating
         self._suspend_auto_plot = True
-        x_options = ['Index'] + cols
-        self._update_combobox(self.x_combo, x_options)
+        num_cols = self._update_column_lists()
         self.x_var.set('Index')
-
-        # Update Y combobox: numeric columns only
-        num_cols = [c for c in cols if pd.api.types.is_numeric_dtype(df[c])]
-        if not num_cols:
-            # if no numeric columns, allow all columns
-            num_cols = cols
-        self._update_combobox(self.y_combo, num_cols)
         if num_cols:
             # set default without triggering plot
             self.y_var.set(num_cols[0])
+        if axes is not None:
+            x_cols = ['Index'] + cols + derivable_channels(cols, self.derived_defs)
+            if axes[0] in x_cols:
+                self.x_var.set(axes[0])
+            if axes[1] in num_cols:
+                self.y_var.set(axes[1])
         self._suspend_auto_plot = False
         
         # Update file label
-        import os
-        self.file_label.config(text=f'✅ {os.path.basename(path)}')
+        self.file_label.config(text=f'✅ {os.path.basename(dataset.path)}')
         self.index_label.config(text=f'📊 {len(df)} points • {len(cols)} colonnes')
         
-        # Show compare button now that we have a file loaded
+        # Show follow and compare buttons now that we have a file loaded
+        self.follow_btn.pack(pady=3)
+        self.follow_frame.pack(fill=tk.X, pady=(0, 3))
         self.compare_btn.pack(pady=3)
         
         # Reset compare mode when loading a new file
@@ -500,116 +969,41 @@ class CsvPlotApp:
         except Exception:
             pass
 
-    def load_compare_csv(self):
-        """Load a second CSV file for comparison"""
+    def load_compare_csv(self, paths=None):
+        """Load one or more CSV files (asked if not given) to compare with the main file"""
+        if self._loading():
+            return
         if self.df is None:
             messagebox.showwarning('Aucun fichier', 'Chargez d\'abord un fichier CSV principal.')
             return
         
-        path = filedialog.askopenfilename(filetypes=[('CSV', '*.csv'), ('All files', '*.*')])
-        if not path:
+        if paths is None:
+            paths = filedialog.askopenfilenames(filetypes=DATA_FILETYPES)
+        if not paths:
             return
 
-        # Read the CSV using the same logic as load_csv
-        df = None
-        sep = None
-        decimal_char = '.'
-        try:
-            with open(path, 'r', newline='', encoding='utf-8') as f:
-                sample = f.read(4096)
-                sniffer = csv.Sniffer()
-                dialect = sniffer.sniff(sample)
-                sep = dialect.delimiter
-                if sep == ';' or (sep != ',' and bool(re.search(r"\d,\d", sample))):
-                    decimal_char = ','
-        except Exception:
-            try:
-                with open(path, 'r', newline='', encoding='utf-8') as f:
-                    sample = f.read(4096)
-                    if ';' in sample:
-                        sep = ';'
-                        if bool(re.search(r"\d,\d", sample)):
-                            decimal_char = ','
-            except Exception:
-                pass
+        # Compare mode and follow mode are exclusive
+        if self._follow_active:
+            self.stop_follow()
 
-        try:
-            if sep:
-                df = pd.read_csv(path, sep=sep, decimal=decimal_char)
-            else:
-                df = pd.read_csv(path)
-        except Exception as e:
-            messagebox.showerror('Erreur', f"Impossible de lire le fichier:\n{e}")
-            return
+        # Only the columns shared with the main file are parsed, within the memory budget
+        runs, used, errors = load_comparison_runs(paths, self.df.columns, (self.x_var.get(), self.y_var.get()),
+                                                  self.derived_defs, self._compare_memory_used())
+        for path, store in runs:
+            self.compare_runs.append({'path': path, 'store': store, 'x_offsets': {}})
 
-        if df is None or df.empty:
-            messagebox.showwarning('Vide', 'Le fichier CSV est vide.')
+        if errors:
+            messagebox.showwarning('Comparaison', 'Certains fichiers n\'ont pas été ajoutés :\n\n' + '\n'.join(errors))
+        if not self.compare_runs:
             return
 
-        # If df has only one column, retry with semicolon
-        if len(df.columns) == 1 and ';' in df.columns[0]:
-            try:
-                df = pd.read_csv(path, sep=';', decimal=',')
-            except Exception:
-                pass
-
-        # Convert datetime columns to seconds (same logic as load_csv)
-        for col in df.columns:
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                try:
-                    first_val = str(df[col].iloc[0])
-                    if '/' in first_val and ':' in first_val:
-                        def parse_french_datetime(val):
-                            try:
-                                val_str = str(val).replace(',', '.')
-                                return pd.to_datetime(val_str, format='%d/%m/%Y %H:%M:%S.%f')
-                            except:
-                                return pd.NaT
-                        datetime_col = df[col].apply(parse_french_datetime)
-                        if datetime_col.notna().all():
-                            time_delta = (datetime_col - datetime_col.iloc[0]).dt.total_seconds()
-                            df[col] = time_delta
-                except Exception:
-                    pass
-
-        # Convert string columns with French decimal format
-        for col in df.columns:
-            if df[col].dtype == object:
-                try:
-                    df[col] = df[col].astype(str).str.replace(',', '.').astype(float)
-                except Exception:
-                    pass
-
-        # Auto-create "Effort Z total (N)" if Z1, Z2, Z3 columns exist
-        z_cols = ['Effort Z1 (N)', 'Effort Z2 (N)', 'Effort Z3 (N)']
-        if all(col in df.columns for col in z_cols):
-            df['Effort Z total (N)'] = df['Effort Z1 (N)'] + df['Effort Z2 (N)'] + df['Effort Z3 (N)']
-
-        # Check if columns match the original file
-        original_cols = set(self.df.columns)
-        compare_cols = set(df.columns)
-        
-        if original_cols != compare_cols:
-            # Show which columns are different
-            missing_in_compare = original_cols - compare_cols
-            extra_in_compare = compare_cols - original_cols
-            msg = "Les colonnes du fichier de comparaison ne correspondent pas au fichier original.\n\n"
-            if missing_in_compare:
-                msg += f"Colonnes manquantes: {', '.join(list(missing_in_compare)[:5])}\n"
-            if extra_in_compare:
-                msg += f"Colonnes supplémentaires: {', '.join(list(extra_in_compare)[:5])}"
-            messagebox.showerror('Colonnes incompatibles', msg)
-            return
-
-        # Store comparison data
-        self.df_compare = df
-        self.compare_file_path = path
         self.compare_mode = True
         
-        # Update UI: show compare label and cancel button, hide filter and export sections
-        import os
-        self.compare_label.config(text=f'🔄 {os.path.basename(path)}')
+        # Update UI: show compare label, options and cancel button, hide filter and export sections
+        self.compare_label.config(text='\n'.join(f'🔄 {os.path.basename(run["path"])}' for run in self.compare_runs)
+                                  + f'\n💾 {used / 2**20:.0f} / {COMPARE_MEMORY_BUDGET / 2**20:.0f} Mo')
         self.compare_label.pack(pady=2)
+        self.compare_options_frame.pack(fill=tk.X, pady=(0, 3))
         self.cancel_compare_btn.pack(pady=3)
         
         # Hide filter and export sections
@@ -618,42 +1012,275 @@ class CsvPlotApp:
         self.export_section.pack_forget()
         self.export_frame.pack_forget()
         
-        # Hide compare button (already comparing)
-        self.compare_btn.pack_forget()
-        
         # Replot with comparison
         self.plot_selected()
 
+    def _compare_memory_used(self):
+        """Bytes held by the main file and the comparison runs"""
+        used = int(self.df.memory_usage(index=False).sum()) if self.df is not None else 0
+        return used + sum(run['store'].nbytes for run in self.compare_runs)
+
     def cancel_compare(self):
         """Cancel comparison mode and return to single file view"""
         self.compare_mode = False
-        self.df_compare = None
-        self.compare_file_path = None
-        self.x_data_compare = None
-        self.y_data_compare = None
+        self.compare_runs = []
         
         # Hide compare-related UI
         self.compare_label.config(text='')
         self.compare_label.pack_forget()
+        self.compare_options_frame.pack_forget()
         self.cancel_compare_btn.pack_forget()
         
-        # Show compare button again
-        self.compare_btn.pack(pady=3)
-        
         # Show filter and export sections again
-        self.filter_section.pack(fill=tk.X, padx=15, pady=(10, 3))
-        self.filter_frame.pack(fill=tk.X, padx=15, pady=(0, 8))
-        self.export_section.pack(fill=tk.X, padx=15, pady=(10, 3))
-        self.export_frame.pack(fill=tk.X, padx=15, pady=(0, 8))
+        self.filter_section.pack(fill=tk.X, padx=15, pady=(10, 3), before=self.analysis_section)
+        self.filter_frame.pack(fill=tk.X, padx=15, pady=(0, 8), before=self.analysis_section)
+        self.export_section.pack(fill=tk.X, padx=15, pady=(10, 3), before=self.analysis_section)
+        self.export_frame.pack(fill=tk.X, padx=15, pady=(0, 8), before=self.analysis_section)
         
         # Replot without comparison
         self.plot_selected()
 
+    def save_session(self):
+        """Save the displayed file, axes, view, selection, filter and comparison runs"""
+        if self.df is None or not self.loaded_file_path:
+            return
+        session = {
+            'file': self.loaded_file_path,
+            'segments': self._segment_paths,
+            'x': self.x_var.get(),
+            'y': self.y_var.get(),
+            'xlim': list(self.ax.get_xlim()),
+            'ylim': list(self.ax.get_ylim()),
+            'base_xlim': list(self._base_xlim) if self._base_xlim is not None else None,
+            'base_ylim': list(self._base_ylim) if self._base_ylim is not None else None,
+            'selected_indices': [int(i) for i in self.selected_indices],
+            'resample_fs': self._resample_target,
+            'filter_cutoff': self.filter_freq_var.get(),
+            'filter_applied': self.y_filtered is not None or self._filter_job is not None,
+            'compare': [{'path': run['path'], 'x_offsets': run['x_offsets']} for run in self.compare_runs]
+                       if self.compare_mode else [],
+        }
+        os.makedirs(SETTINGS_DIR, exist_ok=True)
+        with open(SESSION_FILE, 'w', encoding='utf-8') as f:
+            json.dump(session, f, ensure_ascii=False, indent=2)
+
+    def restore_session(self):
+        """Reload the last session (parsed and filtered columns come from the cache)"""
+        try:
+            with open(SESSION_FILE, 'r', encoding='utf-8') as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            messagebox.showwarning('Session', 'Aucune session enregistrée.')
+            return
+        path = session.get('file')
+        if not path or not os.path.exists(path):
+            messagebox.showwarning('Session', f"Le fichier de la session est introuvable :\n{path}")
+            return
+
+        start = time.perf_counter()
+        segments = session.get('segments')
+        if segments:
+            missing = [p for p in segments if not os.path.exists(p)]
+            if missing:
+                messagebox.showwarning('Session', 'Segments introuvables :\n' + '\n'.join(missing))
+                return
+            self.load_segments(segments, axes=(session.get('x'), session.get('y')))
+        else:
+            self.load_csv(path, axes=(session.get('x'), session.get('y')), preview=False)
+        if self.df is None or self.loaded_file_path != path:
+            return
+
+        if session.get('resample_fs'):
+            self.resample_var.set(f"{session['resample_fs']:g}")
+            self.resample_data()
+        if session.get('filter_cutoff'):
+            self.filter_freq_var.set(session['filter_cutoff'])
+        runs = [run for run in session.get('compare', []) if os.path.exists(run['path'])]
+        if runs:
+            self.load_compare_csv([run['path'] for run in runs])
+            offsets = {run['path']: run['x_offsets'] for run in runs}
+            for run in self.compare_runs:
+                run['x_offsets'].update(offsets.get(run['path'], {}))
+            self.plot_selected()
+        elif session.get('filter_applied'):
+            self.apply_filter()
+
+        # View limits and selection
+        if session.get('base_xlim') and session.get('base_ylim'):
+            self._base_xlim = tuple(session['base_xlim'])
+            self._base_ylim = tuple(session['base_ylim'])
+        if session.get('xlim') and session.get('ylim'):
+            self.ax.set_xlim(session['xlim'])
+            self.ax.set_ylim(session['ylim'])
+        n = len(self.x_data) if self.x_data is not None else 0
+        self.selected_indices = [i for i in session.get('selected_indices', []) if 0 <= i < n][:2]
+        self.canvas.draw_idle()
+
+        text = f'🕘 Session restaurée en {time.perf_counter() - start:.2f} s'
+        if len(self.selected_indices) == 2:
+            text += f' • Début : Index {self.selected_indices[0]} | Fin : Index {self.selected_indices[1]}'
+        self.index_label.config(text=text)
+
+    def _on_close(self):
+        """Save the session before closing the window"""
+        try:
+            self.save_session()
+        except Exception:
+            pass
+        # Background parse and filter results are no longer wanted
+        self._load_job = None
+        self._cancel_filter_job()
+        self.root.destroy()
+
+    def toggle_follow(self):
+        """Start or stop following the loaded file"""
+        if self._follow_active:
+            self.stop_follow()
+        else:
+            self.start_follow()
+
+    def start_follow(self):
+        """Follow the loaded CSV while the acquisition system appends rows to it"""
+        if self._loading():
+            return
+        if self.df is None or not self.loaded_file_path:
+            messagebox.showwarning('Aucun fichier', 'Chargez d\'abord un fichier CSV.')
+            return
+        if self.compare_mode:
+            messagebox.showwarning('Comparaison', 'Annulez la comparaison avant de suivre le fichier.')
+            return
+        if self._segment_paths:
+            messagebox.showwarning('Suivi impossible', 'Le suivi n\'est pas disponible pour des segments concaténés.')
+            return
+        if file_compression(self.loaded_file_path) is not None:
+            messagebox.showwarning('Suivi impossible', 'Le suivi n\'est pas disponible pour les fichiers compressés.')
+            return
+        if self.dataset.csv_format is None:
+            messagebox.showwarning('Suivi impossible', 'Le format de ce fichier n\'a pas pu être détecté de façon fiable.')
+            return
+        if self.dataset.csv_format['encoding'].startswith('utf-16'):
+            # Rows are located by their b'\n' bytes
+            messagebox.showwarning('Suivi impossible', 'Le suivi n\'est pas disponible pour les fichiers UTF-16.')
+            return
+        # The live tail only updates the single plot
+        if self._multi_axes:
+            self.plot_selected()
+        # Derived channels using neighbouring samples can't be computed on the appended rows alone
+        shown = [col for col in (self.x_var.get(), self.y_choice) if uses_history(self.derived_defs, col)]
+        if shown:
+            messagebox.showwarning('Suivi impossible',
+                                   f"Le suivi n'est pas disponible pour {', '.join(shown)} : "
+                                   f"{', '.join(sorted(HISTORY_FUNCTIONS))} dépendent des échantillons voisins.")
+            return
+
+        # Locate the end of the rows already parsed
+        try:
+            n_rows, offset = self.dataset.follow_start()
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible de suivre le fichier :\n{e}")
+            return
+        df = self.df if n_rows == len(self.df) else self.df.iloc[:n_rows]
+
+        # Other such channels are left out of the live tail (recomputed on the whole data when needed)
+        history = [col for col in df.columns if uses_history(self.derived_defs, col)]
+        if history:
+            df = df.drop(columns=history)
+        self._follow_buffer = ColumnBuffer(df)
+        self._follow_offset = offset
+        self._follow_dirty = len(df) != len(self.df)
+        self._follow_active = True
+        self.follow_btn.set_text('⏹ Arrêter le suivi', bg='#f44336', hover_bg='#d32f2f')
+        self._poll_follow()
+
+    def stop_follow(self):
+        """Stop following and rebuild the DataFrame from the appended rows"""
+        if self._follow_after_id is not None:
+            try:
+                self.root.after_cancel(self._follow_after_id)
+            except Exception:
+                pass
+            self._follow_after_id = None
+        self._flush_follow()
+        self._follow_active = False
+        self._follow_buffer = None
+        self.follow_btn.set_text('📡 Suivre le fichier', bg=COLORS['success'], hover_bg='#388E3C')
+
+    def _flush_follow(self):
+        """Materialize the follow buffer as self.df (only when rows were appended)"""
+        if self._follow_buffer is not None and self._follow_dirty:
+            self.dataset.set_data(self._follow_buffer.to_frame())
+            self._follow_dirty = False
+
+    def _read_appended_rows(self):
+        """Parse only the complete rows appended since the last poll"""
+        # Derived channels already in use are computed on the new rows only
+        new_df, self._follow_offset = self.dataset.read_appended(self._follow_offset, self._follow_buffer.columns)
+        return new_df
+
+    def _poll_follow(self):
+        """Periodic check for appended data"""
+        self._follow_after_id = None
+        if not self._follow_active:
+            return
+        try:
+            new_df = self._read_appended_rows()
+        except Exception as e:
+            self.stop_follow()
+            messagebox.showerror('Erreur', f"Suivi du fichier interrompu :\n{e}")
+            return
+        if new_df is not None:
+            self._follow_buffer.append(new_df)
+            self._follow_dirty = True
+            self._update_follow_plot()
+        self._follow_after_id = self.root.after(FOLLOW_POLL_MS, self._poll_follow)
+
+    def _update_follow_plot(self):
+        """Update the displayed curve with the scrolling window, without replotting"""
+        buf = self._follow_buffer
+        x_choice = self.x_var.get()
+        if self.y_choice not in buf.columns or (x_choice != 'Index' and x_choice not in buf.columns):
+            return
+
+        # Views on the buffer: no copy, whatever the file size
+        self.x_data = buf.index_view() if self.x_is_index else buf.view(x_choice)
+        self.y_data = buf.view(self.y_choice)
+        n = buf.size
+
+        try:
+            window_s = float(self.follow_window_var.get())
+        except ValueError:
+            window_s = FOLLOW_DEFAULT_WINDOW_S
+        start = 0
+        if window_s > 0:
+            start = max(0, n - int(window_s * self.sampling_frequency))
+        x_win = self.x_data[start:]
+        y_win = self.y_data[start:]
+
+        if self._main_line is not None:
+            self._main_line.set_data(x_win, y_win)
+        try:
+            x_min, x_max = float(np.nanmin(x_win)), float(np.nanmax(x_win))
+            y_min, y_max = float(np.nanmin(y_win)), float(np.nanmax(y_win))
+            y_margin = (y_max - y_min) * 0.05 or 1.0
+            if x_max > x_min:
+                self.ax.set_xlim(x_min, x_max)
+            self.ax.set_ylim(y_min - y_margin, y_max + y_margin)
+            self._base_xlim = self.ax.get_xlim()
+            self._base_ylim = self.ax.get_ylim()
+            self.minmax_label.config(text=f'X: [{x_min:.2f}, {x_max:.2f}]  |  Y: [{y_min:.2f}, {y_max:.2f}]')
+        except (ValueError, TypeError):
+            pass
+        self.index_label.config(text=f'📡 Suivi : {n} points')
+        self.canvas.draw_idle()
+
     def plot_selected(self):
         if self.df is None:
             messagebox.showwarning('Aucun fichier', 'Chargez d\u00e9abord un fichier CSV.')
             return
 
+        # Pick up rows appended in follow mode
+        self._flush_follow()
+
         x_choice = self.x_var.get()
         y_choice = self.y_var.get()
         if not y_choice:
@@ -661,51 +1288,48 @@ class CsvPlotApp:
             return
 
         try:
+            self._ensure_columns(x_choice, y_choice)
             if x_choice == 'Index':
                 x = self.df.index
             else:
                 x = self.df[x_choice]
             y = self.df[y_choice]
 
+            self._leave_multi_view()
             self.ax.clear()
             self._style_axes()
+            self._compare_view = None
             
             # Get file names for legend
-            import os
             file1_name = os.path.basename(self.loaded_file_path) if self.loaded_file_path else 'Fichier 1'
             
             # Check if we're in comparison mode
-            if self.compare_mode and self.df_compare is not None:
-                # Plot first file
-                self.ax.plot(x, y, linestyle='-', label=file1_name, color='#1565C0', linewidth=1.5)
-                
-                # Get data from comparison file
-                if x_choice == 'Index':
-                    x_compare = self.df_compare.index
-                else:
-                    x_compare = self.df_compare[x_choice]
-                y_compare = self.df_compare[y_choice]
-                
-                # Store comparison data
-                self.x_data_compare = np.asarray(x_compare)
-                self.y_data_compare = np.asarray(y_compare)
-                
-                # Plot second file with different color
-                file2_name = os.path.basename(self.compare_file_path) if self.compare_file_path else 'Fichier 2'
-                self.ax.plot(x_compare, y_compare, linestyle='-', label=file2_name, color='#D32F2F', linewidth=1.5)
+            compare_status = None
+            if self.compare_mode and self.compare_runs:
+                compare_status = self._plot_comparison(x_choice, y_choice, x, y, file1_name)
             else:
-                self.ax.plot(x, y, linestyle='-', label='Original', color='#1565C0', linewidth=1)
+                self._main_line, = self.ax.plot(x, y, linestyle='-', label='Original', color='#1565C0', linewidth=1)
             
             # Store data for index selection
             self.x_data = np.asarray(x)
             self.y_data = np.asarray(y)
+            self._decimated_lines = []
+            if self._main_line is not None:
+                self._track_decimated([(self._main_line, self.y_data)])
             self.y_filtered = None  # Reset filtered data
+            self._cancel_filter_job()
+            self._filter_line = None
             self.y_choice = y_choice  # Store column name
             self.x_is_index = (x_choice == 'Index')
             self.selected_indices = []  # Reset selected indices
+            self._events = None
+            self._event_markers = None
             
             self.ax.set_xlabel(x_choice, fontsize=10)
-            self.ax.set_ylabel(y_choice, fontsize=10)
+            if compare_status is not None and self.compare_diff_var.get():
+                self.ax.set_ylabel(f'Δ {y_choice}', fontsize=10)
+            else:
+                self.ax.set_ylabel(y_choice, fontsize=10)
             
             if self.compare_mode:
                 self.ax.set_title(f'{y_choice} - Comparaison', fontsize=12, fontweight='bold', color=COLORS['text'])
@@ -718,14 +1342,9 @@ class CsvPlotApp:
             self.canvas.draw()
             
             # Update status and min/max
-            if self.compare_mode and self.y_data_compare is not None:
-                self.index_label.config(text=f'🔄 Comparaison: {len(self.x_data)} vs {len(self.x_data_compare)} points')
-                # Show min/max for each curve separately (X and Y)
-                x1_min, x1_max = np.nanmin(self.x_data), np.nanmax(self.x_data)
-                x2_min, x2_max = np.nanmin(self.x_data_compare), np.nanmax(self.x_data_compare)
-                y1_min, y1_max = np.nanmin(self.y_data), np.nanmax(self.y_data)
-                y2_min, y2_max = np.nanmin(self.y_data_compare), np.nanmax(self.y_data_compare)
-                self.minmax_label.config(text=f'X1: [{x1_min:.2f}, {x1_max:.2f}] X2: [{x2_min:.2f}, {x2_max:.2f}]  |  Y1: [{y1_min:.2f}, {y1_max:.2f}] Y2: [{y2_min:.2f}, {y2_max:.2f}]')
+            if compare_status is not None:
+                self.index_label.config(text=compare_status[0])
+                self.minmax_label.config(text=compare_status[1])
             else:
                 self.index_label.config(text=f'📊 {len(self.x_data)} points')
                 x_min, x_max = np.nanmin(self.x_data), np.nanmax(self.x_data)
@@ -742,18 +1361,523 @@ class CsvPlotApp:
         except Exception as e:
             messagebox.showerror('Erreur', f"Impossible de tracer :\n{e}")
 
+    def _plot_comparison(self, x_choice, y_choice, x, y, file1_name):
+        """Plot the main file and the comparison runs aligned on X.
+
+        Runs are min/max decimated like the main curve; differences, envelope
+        and maximum gap come from a common grid rebuilt for the visible X
+        range on zoom/pan. Returns the texts for the status and min/max labels.
+        """
+        x = np.asarray(x)
+        y = np.asarray(y)
+        series = [(x, y, 0.0)]
+        names = [file1_name]
+        skipped = []
+        for run in self.compare_runs:
+            store = run['store']
+            if (not materialize_derived(store, self.derived_defs, y_choice)
+                    or (x_choice != 'Index' and not materialize_derived(store, self.derived_defs, x_choice))):
+                skipped.append(os.path.basename(run['path']))
+                continue
+            x_run = store.index_view() if x_choice == 'Index' else store.view(x_choice)
+            series.append((x_run, store.view(y_choice), run['x_offsets'].get(x_choice, 0.0)))
+            names.append(os.path.basename(run['path']))
+
+        show_diff = self.compare_diff_var.get()
+        if show_diff:
+            self._main_line = None
+            self.ax.axhline(0, label=f'{file1_name} (référence)', color='#1565C0', linewidth=1.5)
+        else:
+            # Main file decimated per pixel for the visible range by plot_selected
+            # (the selection uses the full-resolution arrays, not the line)
+            self._main_line, = self.ax.plot(x, y, linestyle='-', label=file1_name, color='#1565C0', linewidth=1.5)
+        lines = []
+        for i, name in enumerate(names[1:]):
+            label = f'{name} - principal' if show_diff else name
+            line, = self.ax.plot([], [], linestyle='-', label=label,
+                                 color=COMPARE_COLORS[i % len(COMPARE_COLORS)], linewidth=1.5)
+            lines.append(line)
+        self._compare_view = {
+            # (x, y, X shift, x sorted) of the main file then of every run, as views
+            'series': [(xs, ys, offset, xs.dtype.kind in 'iuf' and bool(np.all(np.diff(xs) >= 0)))
+                       for xs, ys, offset in series],
+            'lines': lines,
+            'show_diff': show_diff,
+            'envelope': None,
+            'grid_size': 0,
+            'busy': False,
+            'xlim': None,
+            'preview': False,
+        }
+        minmax = self._update_compare_view(full=True)
+        self.ax.callbacks.connect('xlim_changed', lambda ax: self._update_compare_view())
+
+        status = f"🔄 Comparaison: {len(names)} fichiers • grille de {self._compare_view['grid_size']} points"
+        if skipped:
+            status += f" • ignorés : {', '.join(skipped)}"
+        return status, minmax
+
+    def _update_compare_view(self, full=False):
+        """Redraw the comparison runs for the visible X range (whole runs if full).
+
+        The runs are min/max decimated from their own samples; the differences
+        and the envelope are interpolated on a grid of at most COMPARE_MAX_POINTS
+        points spanning the visible part of the main file. Returns the min/max
+        label text.
+        """
+        view = self._compare_view
+        if view is None or self._follow_active or view['busy']:
+            return None
+        # Adding the envelope asks for an autoscale, which fires xlim_changed again
+        view['busy'] = True
+        try:
+            return self._redraw_compare_view(view, full)
+        finally:
+            view['busy'] = False
+
+    def _redraw_compare_view(self, view, full):
+        """Decimate, align and draw the comparison for the current view (see _update_compare_view)"""
+        xlim = self.ax.get_xlim()
+        if not full and xlim == view['xlim'] and self._interacting == view['preview']:
+            return None
+        view['xlim'], view['preview'] = xlim, self._interacting
+        n_bins = max(1, int(self.ax.bbox.width * MULTI_POINTS_PER_PIXEL / 2))
+        max_points = PREVIEW_MAX_POINTS if self._interacting else None
+        visible = []
+        for k, (x, y, offset, x_sorted) in enumerate(view['series']):
+            if full or not x_sorted:
+                i0, i1 = 0, len(x)
+            else:
+                i0, i1 = visible_slice(x, True, (xlim[0] - offset, xlim[1] - offset))
+            step = 1
+            if max_points and i1 - i0 > max_points:
+                step = -(-(i1 - i0) // max_points)
+            visible.append((x[i0:i1:step], y[i0:i1:step]))
+            if k > 0 and not view['show_diff'] and (x_sorted or full):
+                if x_sorted:
+                    x_dec, y_dec = decimate_range(x, y, i0, i1, n_bins, max_points)
+                else:
+                    # Datetime or unordered X: the run stays at full resolution
+                    x_dec, y_dec = x, y
+                view['lines'][k - 1].set_data(x_dec + offset if offset else x_dec, y_dec)
+
+        if view['envelope'] is not None:
+            view['envelope'].remove()
+            view['envelope'] = None
+        if len(visible[0][0]) < 2 or len(visible) < 2:
+            # No part of the main file in view: nothing to compare against
+            if view['show_diff']:
+                for line in view['lines']:
+                    line.set_data([], [])
+            return None
+
+        # Vectorized interpolation of the visible part of every run on a bounded common grid
+        grid, aligned = align_on_grid(visible[0][0], visible, offsets=[s[2] for s in view['series']])
+        view['grid_size'] = len(grid)
+        diffs = aligned[1:] - aligned[0]
+        if view['show_diff']:
+            for line, curve in zip(view['lines'], diffs):
+                line.set_data(grid, curve)
+
+        # Envelope over all runs (NaN-tolerant reductions, no copy of the raw data)
+        if self.compare_envelope_var.get():
+            rows = diffs if view['show_diff'] else aligned
+            view['envelope'] = self.ax.fill_between(
+                grid, np.fmin.reduce(rows, axis=0), np.fmax.reduce(rows, axis=0),
+                color=COLORS['text_muted'], alpha=0.2, linewidth=0, label='Enveloppe')
+
+        max_diff = np.nanmax(np.abs(diffs)) if np.any(~np.isnan(diffs)) else np.nan
+        y_min, y_max = np.nanmin(aligned), np.nanmax(aligned)
+        minmax = f'X: [{grid[0]:.2f}, {grid[-1]:.2f}]  |  Y: [{y_min:.2f}, {y_max:.2f}]  |  Écart max: {max_diff:.2f}'
+        if not full:
+            self.minmax_label.config(text=minmax)
+        return minmax
+
+    def _track_decimated(self, curves):
+        """Decimate (line, y) curves sharing x_data per pixel and keep them up to date on zoom/pan"""
+        x = self.x_data
+        self._main_x_sorted = x.dtype.kind in 'iuf' and bool(np.all(np.diff(x) >= 0))
+        if not self._main_x_sorted:
+            # Datetime or unordered X: the curves stay at full resolution
+            return
+        self._decimated_lines.extend(curves)
+        self.ax.callbacks.connect('xlim_changed', lambda ax: self._update_main_lines())
+        self._update_main_lines()
+
+    def _update_main_lines(self):
+        """Re-decimate the curves of the single plot for the visible X range"""
+        if not self._decimated_lines or self._follow_active or self.x_data is None:
+            return
+        i0, i1 = visible_slice(self.x_data, True, self.ax.get_xlim())
+        n_bins = max(1, int(self.ax.bbox.width * MULTI_POINTS_PER_PIXEL / 2))
+        max_points = PREVIEW_MAX_POINTS if self._interacting else None
+        for line, y in self._decimated_lines:
+            line.set_data(*decimate_range(self.x_data, y, i0, i1, n_bins, max_points))
+
+    def auto_align_compare(self):
+        """Shift every comparison run to match the main file (FFT cross-correlation)"""
+        if not self.compare_mode or not self.compare_runs or self.x_data is None:
+            return
+        x_choice = self.x_var.get()
+        y_choice = self.y_choice
+        results = []
+        for run in self.compare_runs:
+            store = run['store']
+            name = os.path.basename(run['path'])
+            if y_choice not in store.columns or (x_choice != 'Index' and x_choice not in store.columns):
+                continue
+            x_run = store.index_view() if x_choice == 'Index' else store.view(x_choice)
+            try:
+                shift, r = estimate_lag(self.x_data, self.y_data, x_run, store.view(y_choice))
+            except Exception as e:
+                results.append(f'{name} : {e}')
+                continue
+            run['x_offsets'][x_choice] = shift
+            if x_choice == 'Index':
+                results.append(f'{name} : décalage {shift:+.0f} éch. ({shift / self.sampling_frequency:+.3f} s), r = {r:.3f}')
+            else:
+                results.append(f'{name} : décalage {shift:+.3f} s, r = {r:.3f}')
+
+        self.plot_selected()
+        if results:
+            self.index_label.config(text='⏱ ' + ' • '.join(results))
+
+    def show_stats(self):
+        """Open (or refresh) the statistics window for the selected range"""
+        if self._loading():
+            return
+        if self.df is None:
+            messagebox.showwarning('Aucun fichier', 'Chargez d\'abord un fichier CSV.')
+            return
+        self._flush_follow()
+
+        if self._stats_window is None or not self._stats_window.winfo_exists():
+            self._stats_window = tk.Toplevel(self.root)
+            self._stats_window.title('📐 Statistiques')
+            self._stats_window.configure(bg=COLORS['bg_dark'])
+            self._stats_window.geometry('1100x400')
+            columns = ('mesure', 'moyenne', 'ecart_type', 'rms', 'min', 'max', 'crete_crete',
+                       'p5', 'p50', 'p95', 'integrale', 'temps_seuil')
+            headings = ('Mesure', 'Moyenne', 'Écart-type', 'RMS', 'Min', 'Max', 'Crête-crête',
+                        'P5', 'Médiane', 'P95', 'Intégrale', 'Temps > seuil (s)')
+            self._stats_tree = ttk.Treeview(self._stats_window, columns=columns, show='headings')
+            for col, heading in zip(columns, headings):
+                self._stats_tree.heading(col, text=heading)
+                self._stats_tree.column(col, width=160 if col == 'mesure' else 80, anchor='e')
+            self._stats_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self._refresh_stats_window()
+
+    def _refresh_stats_window(self):
+        """Recompute the statistics of the selected range in the open window"""
+        if self._stats_window is None or not self._stats_window.winfo_exists() or self.df is None:
+            return
+        try:
+            threshold = float(self.threshold_var.get().replace(',', '.'))
+        except ValueError:
+            threshold = None
+
+        if len(self.selected_indices) >= 2:
+            i0, i1 = sorted(self.selected_indices[:2])
+        else:
+            i0, i1 = 0, len(self.df) - 1
+        self._stats_window.title(f'📐 Statistiques - index {i0} à {i1}')
+
+        num_cols = [c for c in self.df.columns if pd.api.types.is_numeric_dtype(self.df[c])]
+        # Tables are kept for the plotted channels only; the others are computed on the range
+        shown = {ax.get_ylabel() for ax in self._multi_axes} if self._multi_axes else {self.y_choice}
+        self._stats_tree.delete(*self._stats_tree.get_children())
+        for col in num_cols:
+            try:
+                res = self.dataset.stats(col, i0, i1 + 1, threshold=threshold, keep_tables=col in shown)
+            except Exception:
+                continue
+            keys = ('mean', 'std', 'rms', 'min', 'max', 'ptp', 'p5', 'p50', 'p95', 'integral', 'time_above')
+            values = [f'{res[k]:.4g}' if k in res else '—' for k in keys]
+            self._stats_tree.insert('', tk.END, values=[col] + values)
+
+    def plot_multi_channel(self):
+        """Plot the selected channels in stacked axes sharing X, in a single render pass"""
+        if self.df is None:
+            messagebox.showwarning('Aucun fichier', 'Chargez d\'abord un fichier CSV.')
+            return
+        if self.compare_mode:
+            messagebox.showwarning('Comparaison', 'Annulez la comparaison pour utiliser la vue multi-voies.')
+            return
+        y_cols = [self.multi_listbox.get(i) for i in self.multi_listbox.curselection()]
+        if not y_cols:
+            messagebox.showwarning('Aucune mesure', 'Sélectionnez une ou plusieurs voies dans la liste.')
+            return
+        # The live tail only updates the single plot
+        if self._follow_active:
+            self.stop_follow()
+        self._flush_follow()
+
+        x_choice = self.x_var.get()
+        try:
+            self._ensure_columns(x_choice, *y_cols)
+            x = self.df.index.to_numpy() if x_choice == 'Index' else self.df[x_choice].to_numpy()
+            self._multi_y = [self.df[col].to_numpy() for col in y_cols]
+
+            self._cancel_filter_job()
+            self._filter_line = None
+            self._compare_view = None
+            self.fig.clear()
+            axes = list(self.fig.subplots(len(y_cols), 1, sharex=True, squeeze=False)[:, 0])
+            self.ax = axes[0]
+            self._multi_axes = axes
+            self._main_line = None
+            self._multi_x_sorted = bool(np.all(np.diff(x) >= 0)) if x.dtype.kind in 'iuf' else False
+
+            self._multi_lines = []
+            palette = ['#1565C0'] + COMPARE_COLORS
+            for i, (ax, col) in enumerate(zip(axes, y_cols)):
+                self._style_axes(ax)
+                # Data is set by _update_multi_lines, at the per-pixel budget
+                line, = ax.plot([], [], linestyle='-', linewidth=1,
+                                color=palette[i % len(palette)])
+                self._multi_lines.append(line)
+                ax.set_ylabel(col, fontsize=8)
+            axes[-1].set_xlabel(x_choice, fontsize=10)
+            axes[0].set_title('Vue multi-voies', fontsize=12, fontweight='bold', color=COLORS['text'])
+
+            # Store data for index selection (first channel)
+            self.x_data = x
+            self.y_data = self._multi_y[0]
+            self.y_filtered = None
+            self.y_choice = y_cols[0]
+            self.x_is_index = (x_choice == 'Index')
+            self.selected_indices = []
+            self._events = None
+            self._event_markers = None
+
+            for ax, y in zip(axes, self._multi_y):
+                y_min, y_max = np.nanmin(y), np.nanmax(y)
+                margin = (y_max - y_min) * 0.05 or 1.0
+                ax.set_ylim(y_min - margin, y_max + margin)
+            axes[0].set_xlim(np.nanmin(x), np.nanmax(x))
+            self.fig.tight_layout()
+            # Reduce every channel to its per-pixel budget before the single draw
+            self._update_multi_lines()
+            self._base_xlim = axes[0].get_xlim()
+            self._base_ylim = axes[0].get_ylim()
+            self._multi_base_ylims = [ax.get_ylim() for ax in axes]
+            axes[0].callbacks.connect('xlim_changed', lambda ax: self._update_multi_lines())
+            self.canvas.draw()
+
+            self.index_label.config(text=f'📚 {len(y_cols)} voies • {len(x)} points')
+            self.minmax_label.config(text=f'X: [{np.nanmin(x):.2f}, {np.nanmax(x):.2f}]')
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible de tracer :\n{e}")
+
+    def _update_multi_lines(self):
+        """Re-decimate the stacked channels for the visible X range (per-pixel budget)"""
+        if not self._multi_axes:
+            return
+        x = self.x_data
+        i0, i1 = visible_slice(x, self._multi_x_sorted, self.ax.get_xlim())
+        max_points = PREVIEW_MAX_POINTS if self._interacting else None
+        for ax, line, y in zip(self._multi_axes, self._multi_lines, self._multi_y):
+            n_bins = max(1, int(ax.bbox.width * MULTI_POINTS_PER_PIXEL / 2))
+            line.set_data(*decimate_range(x, y, i0, i1, n_bins, max_points))
+
+    def _leave_multi_view(self):
+        """Go back to a single axes before a regular plot"""
+        if not self._multi_axes:
+            return
+        self.fig.clear()
+        self.ax = self.fig.add_subplot(111)
+        self._multi_axes = None
+        self._multi_lines = []
+        self._multi_y = []
+        self._multi_base_ylims = []
+
+    def _active_axes(self):
+        """Axes receiving mouse interactions (stacked channels or the single plot)"""
+        return self._multi_axes if self._multi_axes else [self.ax]
+
+    def _reset_view(self):
+        """Restore the limits saved after the last full plot"""
+        if self._multi_axes:
+            for ax, ylim in zip(self._multi_axes, self._multi_base_ylims):
+                ax.set_ylim(ylim)
+            if self._base_xlim is not None:
+                self.ax.set_xlim(self._base_xlim)
+            return
+        if self._base_xlim is not None and self._base_ylim is not None:
+            try:
+                self.ax.set_xlim(self._base_xlim)
+                self.ax.set_ylim(self._base_ylim)
+            except Exception:
+                self.ax.relim()
+                self.ax.autoscale()
+        else:
+            self.ax.relim()
+            self.ax.autoscale()
+
+    def detect_events(self):
+        """Index threshold crossings, peaks, flat lines and dropouts of the displayed channels"""
+        if self._loading():
+            return
+        if self.y_data is None:
+            messagebox.showwarning('Aucune donnée', 'Tracez d\'abord un graphique.')
+            return
+        try:
+            threshold = float(self.threshold_var.get().replace(',', '.'))
+        except ValueError:
+            threshold = None
+        flat_min = max(2, int(EVENT_FLAT_MIN_S * self.sampling_frequency))
+
+        if self._multi_axes:
+            names = [ax.get_ylabel() for ax in self._multi_axes]
+            channels = list(zip(names, self._multi_y))
+        else:
+            channels = [(self.y_choice, self.y_data)]
+        try:
+            self._events = EventIndex([(name, find_events(y, threshold, flat_min))
+                                        for name, y in channels])
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible de détecter les événements :\n{e}")
+            return
+        self._event_pos = None
+
+        # Mark the events on the (first) plot
+        if self._event_markers is not None:
+            try:
+                self._event_markers.remove()
+            except Exception:
+                pass
+        x = np.asarray(self.x_data)
+        y = np.asarray(self.y_data)
+        first = self._events.starts[self._events.channels == 0]
+        self._event_markers, = self.ax.plot(x[first], y[first], linestyle='none', marker='v',
+                                            color=COLORS['warning'], markersize=6, zorder=20)
+        self.canvas.draw_idle()
+
+        counts = np.bincount(self._events.kinds, minlength=len(EVENT_KINDS))
+        detail = ', '.join(f'{kind} : {count}' for kind, count in zip(EVENT_KINDS, counts) if count)
+        self.index_label.config(text=f'🔎 {len(self._events)} événements ({detail or "aucun"})')
+
+    def _on_key_press(self, event):
+        """Keyboard navigation on the plot"""
+        if event.key in ('n', 'pagedown'):
+            self._goto_event(1)
+        elif event.key in ('p', 'pageup'):
+            self._goto_event(-1)
+        elif event.key in ('left', 'right'):
+            x0, x1 = self.ax.get_xlim()
+            shift = (x1 - x0) * PAN_STEP * (1 if event.key == 'right' else -1)
+            # Set before the limits change: the xlim callbacks decimate at preview quality
+            self._interacting = True
+            self.ax.set_xlim(x0 + shift, x1 + shift)
+            self._request_redraw(preview=True)
+        elif event.key in ('up', '+', 'down', '-'):
+            x0, x1 = self.ax.get_xlim()
+            scale = 1 / ZOOM_STEP if event.key in ('up', '+') else ZOOM_STEP
+            center = (x0 + x1) / 2
+            self._interacting = True
+            self.ax.set_xlim(center - (center - x0) * scale, center + (x1 - center) * scale)
+            self._request_redraw(preview=True)
+
+    def _on_scroll(self, event):
+        """Wheel zoom around the cursor: X axis, or Y axis of the hovered plot with Shift"""
+        ax = event.inaxes
+        if ax not in self._active_axes() or event.xdata is None or self.x_data is None:
+            return
+        scale = 1 / ZOOM_STEP if event.button == 'up' else ZOOM_STEP
+        if event.key == 'shift':
+            y0, y1 = ax.get_ylim()
+            ax.set_ylim(event.ydata - (event.ydata - y0) * scale, event.ydata + (y1 - event.ydata) * scale)
+        else:
+            x0, x1 = ax.get_xlim()
+            self._interacting = True
+            ax.set_xlim(event.xdata - (event.xdata - x0) * scale, event.xdata + (x1 - event.xdata) * scale)
+        self._request_redraw(preview=True)
+
+    def _request_redraw(self, preview=False):
+        """Schedule a canvas redraw, coalescing the requests received within a frame.
+
+        preview: the request comes from a pan/zoom step; curves are decimated
+        from a strided subset until no request has arrived for REDRAW_SETTLE_MS,
+        then redrawn at full quality.
+        """
+        if preview:
+            self._interacting = True
+            if self._settle_after_id is not None:
+                self.root.after_cancel(self._settle_after_id)
+            self._settle_after_id = self.root.after(REDRAW_SETTLE_MS, self._settle_redraw)
+        if self._redraw_after_id is None:
+            self._redraw_after_id = self.root.after(REDRAW_FRAME_MS, self._render)
+
+    def _render(self):
+        """Draw the canvas once for all the requests of the frame"""
+        self._redraw_after_id = None
+        self.canvas.draw()
+
+    def _settle_redraw(self):
+        """End of the interaction: re-decimate at full quality and redraw"""
+        self._settle_after_id = None
+        self._interacting = False
+        if self._multi_axes:
+            self._update_multi_lines()
+        else:
+            self._update_main_lines()
+            self._update_compare_view()
+        self._request_redraw()
+
+    def _goto_event(self, direction):
+        """Center the view on the next/previous event and select its range"""
+        if self._events is None or len(self._events) == 0 or self.x_data is None:
+            return
+        x = self.x_data
+        if self._event_pos is not None:
+            # Step through the sorted events: several may start on the same sample
+            pos = self._event_pos + (1 if direction > 0 else -1)
+            if not 0 <= pos < len(self._events):
+                return
+        else:
+            # Start from the center of the current view
+            x_sorted = self._multi_x_sorted if self._multi_axes else self._main_x_sorted
+            center = sum(self.ax.get_xlim()) / 2
+            current = int(np.searchsorted(x, center)) if x_sorted else 0
+            pos = self._events.next_after(current) if direction > 0 else self._events.previous_before(current)
+            if pos is None:
+                return
+        self._event_pos = pos
+        start, end = int(self._events.starts[pos]), int(self._events.ends[pos])
+
+        x0, x1 = self.ax.get_xlim()
+        width = x1 - x0
+        if self._base_xlim is not None and width >= (self._base_xlim[1] - self._base_xlim[0]) * 0.99:
+            # Full view: zoom on 5 % of the range around the event
+            width = (self._base_xlim[1] - self._base_xlim[0]) * 0.05
+        x_start, x_end = float(x[start]), float(x[end])
+        width = max(width, (x_end - x_start) * 1.5)
+        center = (x_start + x_end) / 2
+        self.ax.set_xlim(center - width / 2, center + width / 2)
+
+        self.selected_indices = [start, end]
+        self.index_label.config(
+            text=f'🔎 {pos + 1}/{len(self._events)} : {self._events.describe(pos)} • '
+                 f'Début : Index {start} | Fin : Index {end}')
+        self._refresh_stats_window()
+        self._request_redraw()
+
     def _handle_click(self, event):
         # Only active when X is 'Index'
         if not self.x_is_index or self.x_data is None or self.y_data is None:
             return
-        if event.inaxes != self.ax or event.xdata is None or event.ydata is None:
+        axes = self._active_axes()
+        if event.inaxes not in axes or event.xdata is None or event.ydata is None:
             return
+        ax = event.inaxes
+        # In multi-channel view, pick the channel of the clicked axes
+        y_data = self._multi_y[axes.index(ax)] if self._multi_axes else self.y_data
 
         # Find closest point to click - use a copy to avoid modifying original
         try:
             x_copy = np.array(self.x_data, dtype=float)
-            y_copy = np.array(self.y_data, dtype=float)
-            xy_disp = self.ax.transData.transform(np.column_stack([x_copy, y_copy]))
+            y_copy = np.array(y_data, dtype=float)
+            xy_disp = ax.transData.transform(np.column_stack([x_copy, y_copy]))
             d = np.hypot(xy_disp[:, 0] - event.x, xy_disp[:, 1] - event.y)
             idx = int(np.argmin(d))
         except Exception:
@@ -783,23 +1907,32 @@ class CsvPlotApp:
         # Record press and prepare rectangle for left button
         self._press_event = event
         self._is_dragging = False
-        if event.inaxes != self.ax:
+        # Keyboard shortcuts go to the plot once it has been clicked
+        self.canvas.get_tk_widget().focus_set()
+        if event.inaxes not in self._active_axes():
+            return
+        if event.button == 2:
+            # Middle button: drag to pan (pixel deltas, stable while the limits move)
+            self._pan_start = (event.x, event.y, event.inaxes.get_xlim(), event.inaxes.get_ylim())
             return
         if event.button == 1:
             # start rectangle
             try:
                 self._zoom_rect = Rectangle((event.xdata, event.ydata), 0, 0,
                                             fill=False, color='gray', linestyle='--')
-                self.ax.add_patch(self._zoom_rect)
-                self.canvas.draw_idle()
+                event.inaxes.add_patch(self._zoom_rect)
+                self._request_redraw()
             except Exception:
                 self._zoom_rect = None
 
     def _on_mouse_move(self, event):
+        if self._pan_start is not None:
+            self._pan(event)
+            return
         # Update rectangle during drag
         if self._press_event is None or self._zoom_rect is None:
             return
-        if event.inaxes != self.ax:
+        if event.inaxes is None or event.inaxes != self._press_event.inaxes:
             return
         self._is_dragging = True
         x0, y0 = self._press_event.xdata, self._press_event.ydata
@@ -811,11 +1944,26 @@ class CsvPlotApp:
         width = abs(x1 - x0)
         height = abs(y1 - y0)
         self._zoom_rect.set_bounds(xmin, ymin, width, height)
-        self.canvas.draw_idle()
+        self._request_redraw()
+
+    def _pan(self, event):
+        """Shift the view of the panned axes by the mouse displacement"""
+        x_px, y_px, (x0, x1), (y0, y1) = self._pan_start
+        ax = self._press_event.inaxes
+        dx = (event.x - x_px) * (x1 - x0) / ax.bbox.width
+        dy = (event.y - y_px) * (y1 - y0) / ax.bbox.height
+        self._interacting = True
+        ax.set_xlim(x0 - dx, x1 - dx)
+        ax.set_ylim(y0 - dy, y1 - dy)
+        self._request_redraw(preview=True)
 
     def _on_mouse_release(self, event):
         # Handle release: zoom, reset or click
-        if event.inaxes != self.ax:
+        if self._pan_start is not None:
+            self._pan_start = None
+            self._press_event = None
+            return
+        if event.inaxes not in self._active_axes():
             # cleanup
             if self._zoom_rect is not None:
                 try:
@@ -825,21 +1973,12 @@ class CsvPlotApp:
                 self._zoom_rect = None
             self._press_event = None
             self._is_dragging = False
-            self.canvas.draw_idle()
+            self._request_redraw()
             return
 
         # Right click: reset to base limits
         if event.button == 3:
-            if self._base_xlim is not None and self._base_ylim is not None:
-                try:
-                    self.ax.set_xlim(self._base_xlim)
-                    self.ax.set_ylim(self._base_ylim)
-                except Exception:
-                    self.ax.relim()
-                    self.ax.autoscale()
-            else:
-                self.ax.relim()
-                self.ax.autoscale()
+            self._reset_view()
             if self._zoom_rect is not None:
                 try:
                     self._zoom_rect.remove()
@@ -854,7 +1993,8 @@ class CsvPlotApp:
                 pass
             self._press_event = None
             self._is_dragging = False
-            self.canvas.draw()
+            self._refresh_stats_window()
+            self._request_redraw()
             return
 
         # Left button release: zoom if dragged, otherwise treat as click
@@ -862,7 +2002,8 @@ class CsvPlotApp:
             if self._is_dragging and self._press_event is not None and self._zoom_rect is not None:
                 x0, y0 = self._press_event.xdata, self._press_event.ydata
                 x1, y1 = event.xdata, event.ydata
-                if None in (x0, x1, y0, y1):
+                zoom_ax = self._press_event.inaxes
+                if None in (x0, x1, y0, y1) or event.inaxes is not zoom_ax:
                     # cleanup
                     try:
                         self._zoom_rect.remove()
@@ -871,14 +2012,14 @@ class CsvPlotApp:
                     self._zoom_rect = None
                     self._press_event = None
                     self._is_dragging = False
-                    self.canvas.draw_idle()
+                    self._request_redraw()
                     return
                 xmin, xmax = sorted([x0, x1])
                 ymin, ymax = sorted([y0, y1])
-                # Apply new limits
+                # Apply new limits (X is shared between stacked channels)
                 try:
-                    self.ax.set_xlim(xmin, xmax)
-                    self.ax.set_ylim(ymin, ymax)
+                    zoom_ax.set_xlim(xmin, xmax)
+                    zoom_ax.set_ylim(ymin, ymax)
                 except Exception:
                     pass
                 # Map rectangle X-range to nearest data indices and update selection
@@ -921,7 +2062,8 @@ class CsvPlotApp:
                 self._zoom_rect = None
                 self._press_event = None
                 self._is_dragging = False
-                self.canvas.draw()
+                self._refresh_stats_window()
+                self._request_redraw()
                 return
             else:
                 # treat as click (index selection)
@@ -929,6 +2071,7 @@ class CsvPlotApp:
                     self._handle_click(event)
                 except Exception:
                     pass
+                self._refresh_stats_window()
                 if self._zoom_rect is not None:
                     try:
                         self._zoom_rect.remove()
@@ -937,11 +2080,14 @@ class CsvPlotApp:
                     self._zoom_rect = None
                 self._press_event = None
                 self._is_dragging = False
-                self.canvas.draw_idle()
+                self._request_redraw()
                 return
 
     def apply_filter(self):
         """Apply Butterworth lowpass filter to the Y data"""
+        # The preview rows are strided: the file's sampling frequency does not apply to them
+        if self._loading():
+            return
         if self.y_data is None:
             messagebox.showwarning('Aucune donnée', 'Tracez d\'abord un graphique.')
             return
@@ -970,79 +2116,317 @@ class CsvPlotApp:
                 messagebox.showerror('Erreur', 'La fréquence normalisée doit être positive.')
                 return
             
-            # Design the filter
-            b, a = signal.butter(4, normalized_cutoff, btype='low')
-            
-            # Handle NaN values: interpolate them before filtering
-            y_to_filter = self.y_data.copy()
-            nan_mask = np.isnan(y_to_filter)
-            if np.any(nan_mask):
-                # Interpolate NaN values
-                valid_indices = np.where(~nan_mask)[0]
-                nan_indices = np.where(nan_mask)[0]
-                if len(valid_indices) > 0:
-                    y_to_filter[nan_mask] = np.interp(nan_indices, valid_indices, y_to_filter[valid_indices])
-            
-            # Apply the filter
-            y_filtered = signal.filtfilt(b, a, y_to_filter)
+            # Filtered columns of a cached file are cached too (raw columns only)
+            cache_file = None
+            if (self.loaded_file_path and not self._follow_active and not self.compare_mode
+                    and not self._segment_paths and self._load_job is None
+                    and self.y_choice not in self.derived_defs):
+                cache_file = filter_cache_file(self.loaded_file_path, self.y_choice, normalized_cutoff, fs)
+            try:
+                y_filtered = np.load(cache_file) if cache_file else None
+            except (OSError, ValueError):
+                y_filtered = None
+            label = f'Filtré ({freq_cutoff} Hz)'
+            title = f'{self.y_choice} (filtré à {freq_cutoff} Hz)'
+            if y_filtered is None or len(y_filtered) != len(self.y_data):
+                # Butterworth order 4, zero phase, filtered run by run between NaN gaps
+                validity = None
+                if self.y_choice in self.df.columns and len(self.df) == len(self.y_data):
+                    validity = self.dataset.validity(self.y_choice)
+                rows = self._visible_rows()
+                if rows is not None:
+                    # Zoomed in: filter the visible rows now, the whole channel in the background
+                    preview = lowpass_window(self.y_data, freq_cutoff, fs, *rows, validity=validity)
+                    self.y_filtered = None
+                    if self._filter_line is not None:
+                        # Filter already overlaid (new cutoff): only its curve is replaced
+                        line = self._filter_line
+                        self._cancel_filter_job()
+                        self._decimated_lines = [(l, y) for l, y in self._decimated_lines if l is not line]
+                        n_bins = max(1, int(self.ax.bbox.width * MULTI_POINTS_PER_PIXEL / 2))
+                        line.set_data(*minmax_decimate(self.x_data[rows[0]:rows[1]], preview, n_bins))
+                        line.set_label(label)
+                        self.ax.set_title(title, fontsize=12, fontweight='bold', color=COLORS['text'])
+                        self.ax.legend(loc='upper right', facecolor=COLORS['bg_medium'],
+                                       edgecolor=COLORS['border'], labelcolor=COLORS['text'])
+                        self._request_redraw()
+                    else:
+                        line = self._plot_overlay(preview, label, title, 'Y filtré', rows=rows)
+                    self._filter_line = line
+                    self._filter_job = {
+                        'future': _run_in_background(lowpass_filter, self.y_data, freq_cutoff, fs,
+                                                     validity=validity),
+                        'y': self.y_data, 'line': line, 'cutoff': freq_cutoff, 'cache_file': cache_file,
+                    }
+                    self._poll_background_filter(self._filter_job)
+                    self.index_label.config(text=f'✅ Filtre: {freq_cutoff} Hz (aperçu de la vue)')
+                    return
+                y_filtered = lowpass_filter(self.y_data, freq_cutoff, fs, validity=validity)
+                if cache_file:
+                    try:
+                        np.save(cache_file, y_filtered)
+                    except OSError:
+                        pass
             self.y_filtered = y_filtered
             
             # Redraw with filtered data
-            x_choice = self.x_var.get()
-            x = self.x_data
+            self._filter_line = self._plot_overlay(y_filtered, label, title, 'Y filtré')
+            self.index_label.config(text=self._filter_status(freq_cutoff, y_filtered))
 
-            self.ax.clear()
-            self._style_axes()
-            
-            # Plot original first, then filtered on top with thicker line
-            self.ax.plot(x, self.y_data, linestyle='-', label='Original', 
-                        color='#90CAF9', alpha=0.7, linewidth=0.8)
-            self.ax.plot(x, y_filtered, linestyle='-', label=f'Filtré ({freq_cutoff} Hz)', 
-                        color='#D32F2F', linewidth=2, zorder=10)
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible d'appliquer le filtre:\n{e}")
 
-            self.ax.set_xlabel(x_choice, fontsize=10)
-            self.ax.set_ylabel(self.y_choice, fontsize=10)
-            self.ax.set_title(f'{self.y_choice} (filtré à {freq_cutoff} Hz)', 
-                             fontsize=12, fontweight='bold', color=COLORS['text'])
-            self.ax.legend(loc='upper right', facecolor=COLORS['bg_medium'], 
-                          edgecolor=COLORS['border'], labelcolor=COLORS['text'])
-            
-            # Force auto-scale to show both curves
-            self.ax.relim()
-            self.ax.autoscale_view()
-            
-            self.fig.tight_layout()
+    def _visible_rows(self):
+        """Rows [i0, i1) shown by the zoomed single plot (None if most rows are visible)"""
+        if self._multi_axes or self._follow_active or not self._main_x_sorted or self.x_data is None:
+            return None
+        i0, i1 = visible_slice(self.x_data, True, self.ax.get_xlim())
+        if i1 - i0 > len(self.x_data) * FILTER_PREVIEW_MAX_FRACTION:
+            return None
+        return i0, i1
+
+    def _cancel_filter_job(self):
+        """Drop the background filter job, cancelling it if not started yet"""
+        if self._filter_job is not None:
+            self._filter_job['future'].cancel()
+            self._filter_job = None
+
+    def _poll_background_filter(self, job):
+        """Replace the preview with the whole filtered channel once computed"""
+        if self._filter_job is not job:
+            # Superseded by another filter or plot
+            return
+        if not job['future'].done():
+            self.root.after(FILTER_POLL_MS, lambda: self._poll_background_filter(job))
+            return
+        self._filter_job = None
+        try:
+            y_filtered = job['future'].result()
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible d'appliquer le filtre:\n{e}")
+            return
+        if job['y'] is not self.y_data:
+            return
+        self.y_filtered = y_filtered
+        if job['cache_file']:
+            try:
+                np.save(job['cache_file'], y_filtered)
+            except OSError:
+                pass
+        self._decimated_lines.append((job['line'], y_filtered))
+        self._update_main_lines()
+        self._request_redraw()
+        self.index_label.config(text=self._filter_status(job['cutoff'], y_filtered))
+
+    def _filter_status(self, cutoff, y_filtered):
+        """Status text of the applied filter, with the samples it could not filter"""
+        skipped = unfiltered_samples(self.y_data, y_filtered)
+        if skipped:
+            return f'✅ Filtre: {cutoff} Hz • {skipped} points non filtrés (portions trop courtes)'
+        return f'✅ Filtre: {cutoff} Hz'
+
+    def _resample_target_fs(self):
+        """Target rate of the resampling entry (raises ValueError)"""
+        target = float(self.resample_var.get().replace(',', '.'))
+        if not 0 < target < self.sampling_frequency:
+            raise ValueError
+        return target
+
+    def resample_data(self):
+        """Replace the loaded data by its anti-aliased resampling at the target rate"""
+        if self._loading():
+            return
+        if self.df is None:
+            messagebox.showwarning('Aucun fichier', 'Chargez d\u00e9abord un fichier CSV.')
+            return
+        if self._follow_active:
+            messagebox.showwarning('Rééchantillonnage', 'Arrêtez le suivi du fichier avant de rééchantillonner.')
+            return
+        try:
+            target = self._resample_target_fs()
+        except ValueError:
+            messagebox.showerror('Erreur', f'Entrez une fréquence cible entre 0 et {self.sampling_frequency:g} Hz.')
+            return
 
-            # Force redraw
-            self.canvas.draw()
-            self.canvas.flush_events()
-            
-            # Update status and min/max (showing filtered values)
-            self.index_label.config(text=f'✅ Filtre: {freq_cutoff} Hz')
-            x_min, x_max = np.nanmin(self.x_data), np.nanmax(self.x_data)
-            y_min, y_max = np.nanmin(y_filtered), np.nanmax(y_filtered)
-            self.minmax_label.config(text=f'X: [{x_min:.2f}, {x_max:.2f}]  |  Y filtré: [{y_min:.2f}, {y_max:.2f}]')
+        n_before = len(self.df)
+        try:
+            self.dataset.resample(target)
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible de rééchantillonner :\n{e}")
+            return
+        fs = self.sampling_frequency
+        self._resample_target = target
+        self.sampling_freq_label.config(text=f'{fs:.0f} Hz')
+        self.plot_selected()
+        self.index_label.config(text=f'⬇️ Rééchantillonné à {fs:g} Hz : {n_before} → {len(self.df)} points')
 
-            # Update base limits to include both curves
-            try:
-                self._base_xlim = self.ax.get_xlim()
-                self._base_ylim = self.ax.get_ylim()
-            except Exception:
-                self._base_xlim = None
-                self._base_ylim = None
+    def export_report(self):
+        """Render one image per channel of the main file and of the compared runs, in parallel"""
+        if self._loading():
+            return
+        if self.df is None:
+            messagebox.showwarning('Aucun fichier', 'Chargez d\u00e9abord un fichier CSV.')
+            return
+        out_dir = filedialog.askdirectory(title='Dossier du rapport')
+        if not out_dir:
+            return
+        self._flush_follow()
+
+        # Selected channels of the list, else every channel; selected range, else all rows
+        channels = [self.multi_listbox.get(i) for i in self.multi_listbox.curselection()]
+        if not channels:
+            channels = list(self.multi_listbox.get(0, tk.END))
+        x_choice = self.x_var.get()
+        channels = [col for col in channels if col != x_choice]
+        ranges = None
+        if len(self.selected_indices) >= 2:
+            idx1, idx2 = sorted(self.selected_indices)
+            ranges = [(idx1, idx2 + 1)]
+        fmt = self.report_format_var.get()
 
+        start = time.perf_counter()
+        try:
+            self._ensure_columns(x_choice, *channels)
+            runs = [(self.loaded_file_path, self.df)]
+            if self.compare_mode:
+                runs += [(run['path'], run['store']) for run in self.compare_runs]
+            jobs = []
+            for path, data in runs:
+                # Derived channels of the compared runs are computed on first use
+                cols = [col for col in channels if materialize_derived(data, self.derived_defs, col)]
+                if x_choice != 'Index' and not materialize_derived(data, self.derived_defs, x_choice):
+                    continue
+                x = np.arange(len(data)) if x_choice == 'Index' else data[x_choice].to_numpy()
+                name = file_stem(path)
+                jobs += figure_jobs(name, x, {col: data[col].to_numpy() for col in cols}, x_choice,
+                                    out_dir, fmt, ranges)
+            written, errors = render_figures(jobs)
         except Exception as e:
-            messagebox.showerror('Erreur', f"Impossible d'appliquer le filtre:\n{e}")
+            messagebox.showerror('Erreur', f"Impossible de générer le rapport :\n{e}")
+            return
+
+        elapsed = time.perf_counter() - start
+        message = f'{len(written)} images enregistrées en {elapsed:.1f} s dans :\n{out_dir}'
+        if errors:
+            messagebox.showwarning('Rapport', message + '\n\nErreurs :\n' + '\n'.join(errors))
+        else:
+            messagebox.showinfo('Rapport', message)
+
+    def _plot_overlay(self, curve, label, title, minmax_name, rows=None):
+        """Redraw the original curve with a processed curve (filter, rolling operator) on top.
+
+        rows: (i0, i1) when curve only covers these rows (filter preview); the
+        current view is then kept. Returns the processed curve line.
+        """
+        x_choice = self.x_var.get()
+        x = self.x_data
+        view = (self.ax.get_xlim(), self.ax.get_ylim()) if rows is not None else None
+        self._cancel_filter_job()
+        self._filter_line = None
+
+        self._leave_multi_view()
+        self.ax.clear()
+        self._style_axes()
+        self._compare_view = None
+        
+        # Plot original first, then processed curve on top with thicker line
+        self._main_line, = self.ax.plot(x, self.y_data, linestyle='-', label='Original', 
+                    color='#90CAF9', alpha=0.7, linewidth=0.8)
+        self._decimated_lines = []
+        if rows is None:
+            curve_line, = self.ax.plot(x, curve, linestyle='-', label=label, 
+                        color='#D32F2F', linewidth=2, zorder=10)
+            self._track_decimated([(self._main_line, self.y_data), (curve_line, np.asarray(curve))])
+        else:
+            n_bins = max(1, int(self.ax.bbox.width * MULTI_POINTS_PER_PIXEL / 2))
+            curve_line, = self.ax.plot(*minmax_decimate(x[rows[0]:rows[1]], curve, n_bins), linestyle='-',
+                                       label=label, color='#D32F2F', linewidth=2, zorder=10)
+            self._track_decimated([(self._main_line, self.y_data)])
+
+        self.ax.set_xlabel(x_choice, fontsize=10)
+        self.ax.set_ylabel(self.y_choice, fontsize=10)
+        self.ax.set_title(title, fontsize=12, fontweight='bold', color=COLORS['text'])
+        self.ax.legend(loc='upper right', facecolor=COLORS['bg_medium'], 
+                      edgecolor=COLORS['border'], labelcolor=COLORS['text'])
+        
+        # Force auto-scale to show both curves
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+        # Update base limits to include both curves
+        try:
+            self._base_xlim = self.ax.get_xlim()
+            self._base_ylim = self.ax.get_ylim()
+        except Exception:
+            self._base_xlim = None
+            self._base_ylim = None
+        if view is not None:
+            self.ax.set_xlim(view[0])
+            self.ax.set_ylim(view[1])
+        
+        self.fig.tight_layout()
+
+        # Force redraw
+        self.canvas.draw()
+        self.canvas.flush_events()
+        
+        # Update min/max (showing processed values)
+        x_min, x_max = np.nanmin(self.x_data), np.nanmax(self.x_data)
+        y_min, y_max = np.nanmin(curve), np.nanmax(curve)
+        self.minmax_label.config(text=f'X: [{x_min:.2f}, {x_max:.2f}]  |  {minmax_name}: [{y_min:.2f}, {y_max:.2f}]')
+        return curve_line
+
+    def _rolling_window_samples(self):
+        """Rolling window length in samples, from the seconds or samples entry"""
+        window = float(self.rolling_window_var.get().replace(',', '.'))
+        if window <= 0:
+            raise ValueError('fenêtre négative ou nulle')
+        if self.rolling_unit_var.get() == 's':
+            window *= self.sampling_frequency
+        return max(1, int(round(window)))
+
+    def apply_rolling(self):
+        """Overlay a rolling-window operator (mean, RMS, std, min, max) on the Y data"""
+        if self._loading():
+            return
+        if self.y_data is None:
+            messagebox.showwarning('Aucune donnée', 'Tracez d\'abord un graphique.')
+            return
+        try:
+            n = self._rolling_window_samples()
+        except ValueError:
+            messagebox.showerror('Erreur', 'Entrez une fenêtre valide (nombre positif).')
+            return
+
+        label = self.rolling_op_var.get()
+        op = ROLLING_OPERATORS[label][0]
+        try:
+            curve = rolling_window(self.y_data, n, op)
+            window_text = f'{self.rolling_window_var.get()} {self.rolling_unit_var.get()}'
+            self._plot_overlay(curve, f'{label} glissant(e) ({window_text})',
+                               f'{self.y_choice} ({label} sur {window_text})', f'Y {label}')
+            self.index_label.config(text=f'〰️ {label} glissant(e) sur {n} échantillons')
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible d'appliquer l'opérateur :\n{e}")
 
     def export_csv(self):
+        if self._loading():
+            return
         if self.df is None:
             messagebox.showwarning('Aucun fichier', 'Veuillez d\'abord charger un fichier CSV.')
             return
 
+        # Export the rows appended in follow mode as well, with every derived channel
+        self._flush_follow()
+        try:
+            self._ensure_columns(*derivable_channels(self.df.columns, self.derived_defs))
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible de calculer les voies dérivées :\n{e}")
+            return
+
         # Extract base filename from loaded file path
-        import os
         if self.loaded_file_path:
-            base_filename = os.path.splitext(os.path.basename(self.loaded_file_path))[0]
+            base_filename = file_stem(self.loaded_file_path)
         else:
             base_filename = 'export'
 
@@ -1050,9 +2434,11 @@ class CsvPlotApp:
         # Determine if we have a selection
         has_selection = len(self.selected_indices) >= 2
         is_filtered_export = self.export_filtered_var.get()
+        is_rolling_export = self.export_rolling_var.get()
+        is_resampled_export = self.export_resampled_var.get()
         
         # If not filtered and no selection, error
-        if not is_filtered_export and not has_selection:
+        if not is_filtered_export and not is_rolling_export and not is_resampled_export and not has_selection:
             messagebox.showwarning('Sélection incomplète', 'Veuillez sélectionner deux points (Début et Fin).')
             return
         
@@ -1063,12 +2449,8 @@ class CsvPlotApp:
             begin_idx = idx1
             end_idx = idx2
             
-            # Extract data between indices (inclusive)
-            try:
-                exported_df = self.df.iloc[begin_idx:end_idx + 1].copy()
-            except Exception as e:
-                messagebox.showerror('Erreur', f"Impossible d'extraire les données :\n{e}")
-                return
+            # Export the rows between indices (inclusive)
+            rows = (begin_idx, end_idx + 1)
             
             if is_filtered_export:
                 default_filename = f'{base_filename}_filtré_{begin_idx}_{end_idx}.csv'
@@ -1076,13 +2458,14 @@ class CsvPlotApp:
                 default_filename = f'{base_filename}_{begin_idx}_{end_idx}.csv'
         else:
             # Filtered export without selection: use all data
-            try:
-                exported_df = self.df.copy()
-            except Exception as e:
-                messagebox.showerror('Erreur', f"Impossible de copier les données :\n{e}")
-                return
+            rows = (None, None)
             
-            default_filename = f'{base_filename}_filtré_complet.csv'
+            if is_filtered_export:
+                default_filename = f'{base_filename}_filtré_complet.csv'
+            elif is_rolling_export:
+                default_filename = f'{base_filename}_glissant_complet.csv'
+            else:
+                default_filename = f'{base_filename}_complet.csv'
 
         # Ask user for save location
         # If filtered export, include cutoff frequency in default filename
@@ -1099,60 +2482,75 @@ class CsvPlotApp:
 
         save_path = filedialog.asksaveasfilename(
             defaultextension='.csv',
-            filetypes=[('CSV files', '*.csv'), ('All files', '*.*')],
+            filetypes=DATA_FILETYPES,
             initialfile=default_filename
         )
 
         if not save_path:
             return
 
-        # Check if filtered export is requested
-        if self.export_filtered_var.get():
-            # Apply filter to all numeric columns
+        # Filter cutoff (filtered copy of every numeric column)
+        freq_cutoff = None
+        if is_filtered_export:
             try:
                 freq_cutoff = float(self.filter_freq_var.get())
-                if freq_cutoff <= 0:
-                    messagebox.showerror('Erreur', 'Veuillez entrer une fréquence valide pour le filtrage.')
-                    return
-                
-                # Design filter
-                fs = self.sampling_frequency
-                normalized_cutoff = freq_cutoff / (fs / 2)
-                if normalized_cutoff >= 1:
-                    normalized_cutoff = 0.99
-                
-                b, a = signal.butter(4, normalized_cutoff, btype='low')
-                
-                # Get numeric columns (skip first column which is time)
-                numeric_cols = [c for c in exported_df.columns if pd.api.types.is_numeric_dtype(exported_df[c])]
-                if len(exported_df.columns) > 0:
-                    # Skip first column (time) in numeric columns to filter
-                    numeric_cols = [c for c in numeric_cols if c != exported_df.columns[0]]
-                
-                # Apply filter to each numeric column and add filtered version
-                for col in numeric_cols:
-                    filtered_data = signal.filtfilt(b, a, exported_df[col].values)
-                    exported_df[f'{col}_filtré'] = filtered_data
-                
             except ValueError:
                 messagebox.showerror('Erreur', 'Entrez une fréquence valide (nombre).')
                 return
-            except Exception as e:
-                messagebox.showerror('Erreur', f"Impossible d'appliquer le filtre :\n{e}")
+            if freq_cutoff <= 0:
+                messagebox.showerror('Erreur', 'Veuillez entrer une fréquence valide pour le filtrage.')
                 return
 
-        # Save the exported data
+        # Rolling operator of every numeric column
+        rolling = None
+        if is_rolling_export:
+            try:
+                op, suffix = ROLLING_OPERATORS[self.rolling_op_var.get()]
+                rolling = (self._rolling_window_samples(), op, suffix)
+            except ValueError:
+                messagebox.showerror('Erreur', 'Entrez une fenêtre valide (nombre positif).')
+                return
+
+        # Target rate of the exported rows
+        target_fs = None
+        if is_resampled_export:
+            try:
+                target_fs = self._resample_target_fs()
+            except ValueError:
+                messagebox.showerror('Erreur', f'Entrez une fréquence cible entre 0 et {self.sampling_frequency:g} Hz.')
+                return
+
+        try:
+            exported = export_columns(self.df, rows[0], rows[1], freq_cutoff, self.sampling_frequency, rolling,
+                                      validity=self.dataset.validity, target_fs=target_fs)
+        except Exception as e:
+            messagebox.showerror('Erreur', f"Impossible de calculer les colonnes exportées :\n{e}")
+            return
+
+        # Save the exported data (format given by the extension)
         try:
-            exported_df.to_csv(save_path, index=False)
+            start = time.perf_counter()
+            write_table(exported, save_path)
+            elapsed = max(time.perf_counter() - start, 1e-6)
+            n_rows = len(next(iter(exported.values()))) if exported else 0
+            size_mb = os.path.getsize(save_path) / 2**20
+            throughput = f'{size_mb:.1f} Mo en {elapsed:.2f} s ({size_mb / elapsed:.1f} Mo/s, {n_rows / elapsed:.0f} lignes/s)'
             if self.export_filtered_var.get():
-                messagebox.showinfo('Succès', f'Fichier exporté avec filtrage :\n{save_path}\n\n{len(exported_df)} lignes sauvegardées avec colonnes filtrées.')
+                skipped = sum(unfiltered_samples(exported[col[:-len('_filtré')]], y)
+                              for col, y in exported.items() if col.endswith('_filtré'))
+                if skipped:
+                    throughput += f'\n{skipped} points laissés vides : portions trop courtes pour le filtre.'
+                messagebox.showinfo('Succès', f'Fichier exporté avec filtrage :\n{save_path}\n\n{n_rows} lignes sauvegardées avec colonnes filtrées.\n{throughput}')
             else:
-                messagebox.showinfo('Succès', f'Fichier exporté avec succès :\n{save_path}\n\n{len(exported_df)} lignes sauvegardées.')
+                messagebox.showinfo('Succès', f'Fichier exporté avec succès :\n{save_path}\n\n{n_rows} lignes sauvegardées.\n{throughput}')
         except Exception as e:
             messagebox.showerror('Erreur', f"Impossible de sauvegarder le fichier :\n{e}")
 
 
 if __name__ == '__main__':
+    # Worker processes of the frozen Windows executable must not start the GUI
+    multiprocessing.freeze_support()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
     root = tk.Tk()
     app = CsvPlotApp(root)
     root.mainloop()
@@ -0,0 +1,150 @@
+"""Headless rendering of channel plots to image files (PNG, PDF, SVG) for reports.
+
+Uses the Agg canvas directly (no Tk, no pyplot) so that figures can be drawn
+in worker processes; they share the light theme of the GUI::
+
+    from render import render_report
+    render_report(['essai_01.csv', 'essai_02.csv'], 'rapport', fmt='pdf')
+"""
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from csv_core import Dataset, file_stem, materialize_derived, minmax_decimate
+
+logger = logging.getLogger(__name__)
+
+# Modern color scheme - Light theme
+COLORS = {
+    'bg_dark': '#f5f5f5',
+    'bg_medium': '#ffffff',
+    'bg_light': '#e8e8e8',
+    'accent': '#2196F3',
+    'accent_hover': '#1976D2',
+    'text': '#333333',
+    'text_muted': '#666666',
+    'success': '#4CAF50',
+    'warning': '#FF9800',
+    'border': '#d0d0d0'
+}
+
+# Report figures: size (inches), resolution and points drawn per figure (min/max
+# decimation, two points per pixel column as in the GUI)
+REPORT_FIGSIZE = (10, 4)
+REPORT_DPI = 120
+REPORT_MAX_POINTS = 2 * REPORT_FIGSIZE[0] * REPORT_DPI
+REPORT_FORMATS = ('png', 'pdf', 'svg')
+
+
+def style_axes(ax):
+    """Apply light theme to matplotlib axes"""
+    ax.set_facecolor('#ffffff')
+    ax.tick_params(colors=COLORS['text'], which='both')
+    ax.xaxis.label.set_color(COLORS['text'])
+    ax.yaxis.label.set_color(COLORS['text'])
+    ax.title.set_color(COLORS['text'])
+    for spine in ax.spines.values():
+        spine.set_color(COLORS['border'])
+    ax.grid(True, color=COLORS['border'], alpha=0.5, linestyle='--')
+
+
+def _render_batch(jobs):
+    """Draw channels like the single plot of the GUI, reusing one figure; returns (paths, errors)"""
+    fig = Figure(figsize=REPORT_FIGSIZE, facecolor=COLORS['bg_medium'])
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    style_axes(ax)
+    line, = ax.plot([], [], linestyle='-', color='#1565C0', linewidth=1)
+    paths, errors = [], []
+    for job in jobs:
+        try:
+            line.set_data(job['x'], job['y'])
+            ax.relim()
+            ax.autoscale_view()
+            ax.set_xlabel(job['x_label'], fontsize=10)
+            ax.set_ylabel(job['y_label'], fontsize=10)
+            ax.set_title(job['title'], fontsize=12, fontweight='bold', color=COLORS['text'])
+            fig.tight_layout()
+            # Format from the extension
+            fig.savefig(job['path'], dpi=REPORT_DPI, facecolor=fig.get_facecolor())
+            paths.append(job['path'])
+        except Exception as e:
+            errors.append(f"{os.path.basename(job['path'])} : {e}")
+    return paths, errors
+
+
+def _safe_filename(name):
+    """File name without the characters forbidden on Windows (units like m/s)"""
+    return re.sub(r'[<>:"/\\|?*]+', '_', name).strip()
+
+
+def figure_jobs(name, x, channels, x_label, out_dir, fmt='png', ranges=None, max_points=REPORT_MAX_POINTS):
+    """Figures to render for every channel and row range of a run.
+
+    channels maps each channel name to its values; ranges are [start, stop)
+    row ranges (whole run if None). The data is min/max decimated here, so
+    only a few thousand points per figure are sent to the workers.
+    """
+    jobs = []
+    for col, values in channels.items():
+        for start, stop in ranges or [(None, None)]:
+            x_dec, y_dec = minmax_decimate(x[start:stop], values[start:stop], max_points // 2)
+            suffix = '' if start is None and stop is None else f'_{start}_{stop - 1}'
+            jobs.append({
+                'x': x_dec, 'y': y_dec,
+                'path': os.path.join(out_dir, _safe_filename(f'{name}_{col}{suffix}.{fmt}')),
+                'x_label': x_label, 'y_label': col, 'title': f'{col} - {name}',
+            })
+    return jobs
+
+
+def render_figures(jobs, max_workers=None):
+    """Render figure jobs (see figure_jobs) in worker processes; returns (written paths, error messages)"""
+    paths, errors = [], []
+    if not jobs:
+        return paths, errors
+    # Drawing holds the GIL: one process per core, a few batches each to balance the load
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    n_batches = min(len(jobs), 4 * workers)
+    batches = [jobs[i::n_batches] for i in range(n_batches)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch_paths, batch_errors in pool.map(_render_batch, batches):
+            paths += batch_paths
+            errors += batch_errors
+    return paths, errors
+
+
+def render_report(paths, out_dir, fmt='png', channels=None, x_col=None, ranges=None, max_workers=None,
+                  derived_defs=None):
+    """One figure per channel (and row range) of every file, rendered in parallel.
+
+    channels: column names (every numeric column but the first by default);
+    x_col: X column (the first column by default, 'Index' for row numbers);
+    derived_defs: derived channel definitions (see Dataset).
+    Returns (written paths, error messages).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs, errors = [], []
+    for path in paths:
+        name = file_stem(path)
+        try:
+            ds = Dataset.load(path, derived_defs=derived_defs)
+            df = ds.df
+            x_name = x_col or df.columns[0]
+            cols = list(channels or [c for c in df.columns[1:] if df[c].dtype.kind in 'iuf'])
+            for col in cols + ([x_name] if x_name != 'Index' else []):
+                if not materialize_derived(df, ds.derived_defs, col):
+                    raise KeyError(col)
+            x = np.arange(len(df)) if x_name == 'Index' else df[x_name].to_numpy()
+            jobs += figure_jobs(name, x, {col: df[col].to_numpy() for col in cols}, x_name,
+                                out_dir, fmt, ranges)
+        except Exception as e:
+            logger.warning('%s: ignoré pour le rapport (%s)', path, e)
+            errors.append(f"{os.path.basename(path)} : {e}")
+    written, render_errors = render_figures(jobs, max_workers)
+    return written, errors + render_errors
@@ -0,0 +1,230 @@
+"""Numeric checks of csv_core against straightforward reference implementations (pytest)."""
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import signal
+
+import csv_core
+from csv_core import (
+    STATS_TABLE_COLUMNS, ColumnBuffer, Dataset, _concat_segments, _estimate_frame_bytes, _RangeStats,
+    _ValidityMap, estimate_lag, load_comparison_runs, lowpass_filter, lowpass_window, rolling_window,
+    resample_columns, unfiltered_samples,
+)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_comparison_runs_report_unreadable_archives(tmp_path):
+    good = tmp_path / 'essai.csv.gz'
+    pd.DataFrame({'t': np.arange(100) / 10.0, 'A': np.arange(100.0)}).to_csv(good, index=False)
+    corrupt = tmp_path / 'coupe.csv.xz'
+    corrupt.write_bytes(b'\xfd7zXZ\x00 tronque')
+    archive = tmp_path / 'double.zip'
+    with zipfile.ZipFile(archive, 'w') as z:
+        z.writestr('a.csv', 't,A\n0,1\n')
+        z.writestr('b.csv', 't,A\n0,1\n')
+    not_zip = tmp_path / 'faux.zip'
+    not_zip.write_bytes(b'pas une archive')
+    runs, used, errors = load_comparison_runs([str(good), str(corrupt), str(archive), str(not_zip)], ['t', 'A'])
+    assert [os.path.basename(path) for path, _ in runs] == ['essai.csv.gz']
+    assert used > 0
+    assert sorted(e.split(' : ')[0] for e in errors) == ['coupe.csv.xz', 'double.zip', 'faux.zip']
+
+
+def test_frame_estimate_of_compressed_csv(tmp_path):
+    df = pd.DataFrame({'t': np.arange(20000) / 1000.0, 'A': np.zeros(20000)})
+    plain, packed = tmp_path / 'essai.csv', tmp_path / 'essai.csv.gz'
+    df.to_csv(plain, index=False)
+    df.to_csv(packed, index=False)
+    expected = _estimate_frame_bytes(str(plain), 2)
+    assert _estimate_frame_bytes(str(packed), 2) == pytest.approx(expected, rel=0.5)
+
+
+def test_dataset_reads_appended_rows(tmp_path):
+    path = tmp_path / 'suivi.csv'
+    path.write_text('t;A\n0,0;1,5\n0,1;2,5\n', encoding='utf-8')
+    ds = Dataset.load(str(path), use_cache=False)
+    n_rows, offset = ds.follow_start()
+    assert n_rows == 2
+    buffer = ColumnBuffer(ds.df)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('0,2;3,5\n0,3;4')
+    new_rows, offset = ds.read_appended(offset, buffer.columns)
+    buffer.append(new_rows)
+    assert buffer.view('A').tolist() == [1.5, 2.5, 3.5]
+    # The partial last line is read once complete
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(',5\n')
+    new_rows, offset = ds.read_appended(offset, buffer.columns)
+    assert new_rows['A'].tolist() == [4.5]
+    assert ds.read_appended(offset)[0] is None
+
+
+def test_estimate_lag_recovers_shift(rng):
+    fs = 100.0
+    t = np.arange(3000) / fs
+    y_ref = np.convolve(rng.normal(size=len(t)), np.ones(20) / 20, mode='same')
+    delay = 1.5
+    y = np.interp(t - delay, t, y_ref, left=0.0, right=0.0)
+    shift, r = estimate_lag(t, y_ref, t, y)
+    assert shift == pytest.approx(-delay, abs=1 / fs)
+    assert r > 0.99
+
+
+def _with_gaps(values):
+    values = values.copy()
+    values[[0, 17, 18, 19, 250, len(values) - 1]] = np.nan
+    return values
+
+
+def test_range_stats_match_numpy(rng):
+    t = np.arange(5000) / 100.0
+    y = rng.normal(0.0, 1.0, len(t)).cumsum()
+    stats = _RangeStats(y, np.diff(t))
+    for i0, i1 in [(0, len(y) - 1), (10, 11), (1000, 3071), (2047, 2048), (4999, 4999)]:
+        res = stats.stats(i0, i1, threshold=0.0)
+        w, tw = y[i0:i1 + 1], t[i0:i1 + 1]
+        assert res['count'] == len(w)
+        assert res['mean'] == pytest.approx(w.mean())
+        assert res['std'] == pytest.approx(w.std(), abs=1e-9)
+        assert res['rms'] == pytest.approx(np.sqrt(np.mean(w * w)))
+        assert res['min'] == w.min() and res['max'] == w.max()
+        assert res['integral'] == pytest.approx(np.sum((w[1:] + w[:-1]) / 2 * np.diff(tw)), abs=1e-9)
+        assert res['time_above'] == pytest.approx(np.sum(np.diff(tw)[w[:-1] > 0.0]))
+        assert res['p50'] == pytest.approx(np.percentile(w, 50))
+
+
+def test_range_stats_ignore_nan(rng):
+    y = _with_gaps(rng.normal(0.0, 1.0, 3000))
+    res = _RangeStats(y, np.ones(len(y) - 1)).stats(0, len(y) - 1)
+    assert res['count'] == np.count_nonzero(~np.isnan(y))
+    assert res['mean'] == pytest.approx(np.nanmean(y))
+    assert res['min'] == np.nanmin(y) and res['max'] == np.nanmax(y)
+
+
+def test_dataset_stats_with_and_without_tables(rng):
+    df = pd.DataFrame({'t': np.arange(4000) / 1000.0})
+    for i in range(STATS_TABLE_COLUMNS + 2):
+        df[f'V{i}'] = _with_gaps(rng.normal(i, 1.0, len(df)))
+    ds = Dataset(df)
+    for i in range(STATS_TABLE_COLUMNS + 2):
+        direct = ds.stats(f'V{i}', 100, 3000, threshold=float(i))
+        tables = ds.stats(f'V{i}', 100, 3000, threshold=float(i), keep_tables=True)
+        assert direct.keys() == tables.keys()
+        for key in direct:
+            assert tables[key] == pytest.approx(direct[key])
+    # Only the last columns keep their tables
+    assert list(ds._stats) == [f'V{i}' for i in range(2, STATS_TABLE_COLUMNS + 2)]
+
+
+@pytest.mark.parametrize('op', ['mean', 'rms', 'std', 'min', 'max'])
+def test_rolling_matches_naive_window(rng, op):
+    y = _with_gaps(rng.normal(5.0, 2.0, 500))
+    n = 7
+    reference = {'mean': np.nanmean, 'rms': lambda w: np.sqrt(np.nanmean(w * w)),
+                 'std': np.nanstd, 'min': np.nanmin, 'max': np.nanmax}[op]
+    expected = [reference(y[max(0, i - n // 2):i - n // 2 + n]) for i in range(len(y))]
+    np.testing.assert_allclose(rolling_window(y, n, op), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_concat_segments_continuous_time_and_common_columns():
+    seg1 = pd.DataFrame({'t': [0.0, 0.1, 0.2], 'A': [1, 2, 3], 'B': [0.5, 0.5, 0.5]})
+    seg2 = pd.DataFrame({'t': [0.0, 0.1], 'A': [4, 5]})
+    df, dropped = _concat_segments([(seg1, {}), (seg2, {})])
+    assert list(df.columns) == ['t', 'A']
+    assert dropped == ['B']
+    np.testing.assert_allclose(df['t'], [0.0, 0.1, 0.2, 0.3, 0.4])
+    assert df['A'].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_concat_segments_rebases_datetime_origins():
+    origin = pd.Timestamp('2026-01-30 13:57:56')
+    seg1 = pd.DataFrame({'Temps': [0.0, 1.0], 'A': [1.0, 2.0]})
+    seg2 = pd.DataFrame({'Temps': [0.0, 1.0], 'A': [3.0, 4.0]})
+    df, _ = _concat_segments([(seg1, {'Temps': origin}), (seg2, {'Temps': origin + pd.Timedelta(seconds=10)})])
+    np.testing.assert_allclose(df['Temps'], [0.0, 1.0, 10.0, 11.0])
+
+
+def test_dataset_load_has_no_user_state(tmp_path, monkeypatch):
+    settings = tmp_path / 'reglages'
+    monkeypatch.setattr(csv_core, 'SETTINGS_DIR', str(settings))
+    monkeypatch.setattr(csv_core, 'CACHE_DIR', str(settings / 'cache'))
+    monkeypatch.setattr(csv_core, 'CACHE_MIN_BYTES', 0)
+    monkeypatch.setattr(csv_core, 'DERIVED_FILE', str(settings / 'derived_channels.json'))
+    path = tmp_path / 'essai.csv'
+    path.write_text('t;A;B\n0,0;1,0;2,0\n0,1;3,0;4,0\n', encoding='utf-8')
+    csv_core.save_derived_definitions(csv_core.column_signature(['t', 'A', 'B']), {'S': '`A` + `B`'})
+
+    ds = Dataset.load(str(path))
+    assert 'S' not in ds.columns
+    assert not (settings / 'cache').exists()
+    ds = Dataset.load(str(path), derived_defs={'S': '`A` + `B`'})
+    assert ds.column('S').tolist() == [3.0, 7.0]
+
+
+def test_validity_map_runs_and_slice():
+    y = np.array([np.nan, 1, 2, np.nan, np.nan, 3, 4, 5, np.nan, 6])
+    validity = _ValidityMap(y)
+    assert validity.starts.tolist() == [1, 5, 9]
+    assert validity.ends.tolist() == [3, 8, 10]
+    assert validity.n_valid == 6
+    part = validity.slice(2, 7)
+    assert len(part) == 5
+    assert part.starts.tolist() == [0, 3] and part.ends.tolist() == [1, 5]
+    # Integer columns have no gaps
+    assert _ValidityMap(np.arange(4)).starts.tolist() == [0]
+
+
+def test_lowpass_keeps_gaps_and_matches_filtfilt_per_run(rng):
+    fs, cutoff = 1000.0, 20.0
+    y = rng.normal(0.0, 1.0, 4000)
+    y[2000:2010] = np.nan
+    filtered = lowpass_filter(y, cutoff, fs)
+    assert np.isnan(filtered[2000:2010]).all()
+    b, a = signal.butter(4, cutoff / (fs / 2), btype='low')
+    np.testing.assert_allclose(filtered[:2000], signal.filtfilt(b, a, y[:2000]))
+
+
+def test_lowpass_leaves_short_runs_empty(rng):
+    y = rng.normal(0.0, 1.0, 1000)
+    # Sparse end of the record: runs of 4 samples between single gaps
+    y[600::5] = np.nan
+    filtered = lowpass_filter(y, 20.0, 1000.0)
+    assert np.isnan(filtered[600:]).all()
+    assert not np.isnan(filtered[:600]).any()
+    assert unfiltered_samples(y, filtered) == np.count_nonzero(~np.isnan(y[600:]))
+
+
+def test_lowpass_window_matches_whole_column(rng):
+    fs, cutoff = 1000.0, 20.0
+    y = rng.normal(0.0, 1.0, 50000)
+    y[30000:30050] = np.nan
+    validity = _ValidityMap(y)
+    whole = lowpass_filter(y, cutoff, fs, validity=validity)
+    for start, stop in [(10000, 12000), (29000, 31000), (0, 500), (49500, 50000)]:
+        window = lowpass_window(y, cutoff, fs, start, stop, validity=validity)
+        np.testing.assert_allclose(window, whole[start:stop], atol=1e-6)
+
+
+def test_resample_columns_keeps_in_band_signal():
+    fs, target = 1000.0, 100.0
+    t = np.arange(20000) / fs
+    y = np.sin(2 * np.pi * 2.0 * t) + 0.5 * np.sin(2 * np.pi * 300.0 * t)
+    y[5000:5100] = np.nan
+    columns, new_fs = resample_columns({'t': t, 'y': y}, fs, target)
+    assert new_fs == target
+    assert len(columns['t']) == 2000
+    np.testing.assert_allclose(columns['t'], np.arange(2000) / target)
+    # The 300 Hz component is above the new Nyquist frequency: only the 2 Hz one is left
+    expected = np.sin(2 * np.pi * 2.0 * columns['t'])
+    assert np.isnan(columns['y'][500:510]).all()
+    # Away from the edges and from the bridged gap
+    away = np.abs(columns['t'] - 5.05) > 0.5
+    away[:50] = away[-50:] = False
+    assert np.max(np.abs(columns['y'][away] - expected[away])) < 0.02